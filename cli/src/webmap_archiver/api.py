@@ -15,19 +15,23 @@ Example usage:
     print(f"Created archive with {result.tile_count} tiles")
 """
 
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
+import asyncio
 import tempfile
 import json
+import mmap
+import os
 
 from .capture.parser import CaptureParser, CaptureValidationError
 from .capture.processor import process_capture_bundle
-from .tiles.pmtiles import PMTilesBuilder, PMTilesMetadata
+from .tiles.pmtiles import PMTilesBuilder, PMTilesMetadata, in_memory_limits, map_builds
 from .tiles.coverage import CoverageCalculator, GeoBounds
 from .tiles.layer_inspector import discover_layers_from_tiles, extract_layer_names_protobuf
-from .viewer.generator import ViewerGenerator, ViewerConfig
-from .archive.packager import ArchivePackager, TileSourceInfo
+from .viewer.generator import ViewerGenerator, ViewerConfig, prepare_captured_style
+from .archive.packager import ArchivePackager, TileSourceInfo, dumps_indented
 
 
 # ============================================================================
@@ -123,6 +127,9 @@ async def create_archive_from_bundle_async(
     mode: str = "standalone",
     expand_coverage: bool = False,
     verbose: bool = False,
+    jobs: int | None = None,
+    compression: str = "gzip",
+    executor: Executor | None = None,
 ) -> ArchiveResult:
     """
     Async version of create_archive_from_bundle.
@@ -141,6 +148,12 @@ async def create_archive_from_bundle_async(
         expand_coverage: If True, fetch additional tiles to expand zoom coverage.
                         Requires aiohttp: pip install aiohttp
         verbose: If True, print progress information
+        jobs: Maximum number of tile sources to build in parallel
+              (default: CPU count)
+        compression: Vector tile compression in PMTiles, "gzip" or "none"
+                     (raster tiles are stored as-is)
+        executor: Worker pool for parallel PMTiles builds, shared with the
+                  caller's other parallel steps (default: a pool per call)
 
     Returns:
         ArchiveResult with metadata about the created archive
@@ -181,6 +194,9 @@ async def create_archive_from_bundle_async(
         mode=mode,
         expand_coverage=expand_coverage,
         verbose=verbose,
+        jobs=jobs,
+        compression=compression,
+        executor=executor,
     )
 
     return result
@@ -194,6 +210,9 @@ def create_archive_from_bundle(
     mode: str = "standalone",
     expand_coverage: bool = False,
     verbose: bool = False,
+    jobs: int | None = None,
+    compression: str = "gzip",
+    executor: Executor | None = None,
 ) -> ArchiveResult:
     """
     Create an archive from a capture bundle (synchronous wrapper).
@@ -214,6 +233,12 @@ def create_archive_from_bundle(
         expand_coverage: If True, fetch additional tiles to expand zoom coverage.
                         Requires aiohttp: pip install aiohttp
         verbose: If True, print progress information
+        jobs: Maximum number of tile sources to build in parallel
+              (default: CPU count)
+        compression: Vector tile compression in PMTiles, "gzip" or "none"
+                     (raster tiles are stored as-is)
+        executor: Worker pool for parallel PMTiles builds, shared with the
+                  caller's other parallel steps (default: a pool per call)
 
     Returns:
         ArchiveResult with metadata about the created archive
@@ -223,8 +248,6 @@ def create_archive_from_bundle(
         ValueError: If required data is missing
         RuntimeError: If called from an async context
     """
-    import asyncio
-
     return asyncio.run(
         create_archive_from_bundle_async(
             bundle=bundle,
@@ -233,6 +256,9 @@ def create_archive_from_bundle(
             mode=mode,
             expand_coverage=expand_coverage,
             verbose=verbose,
+            jobs=jobs,
+            compression=compression,
+            executor=executor,
         )
     )
 
@@ -537,6 +563,9 @@ async def _build_archive(
     mode: str,
     expand_coverage: bool,
     verbose: bool,
+    jobs: int | None = None,
+    compression: str = "gzip",
+    executor: Executor | None = None,
 ) -> ArchiveResult:
     """
     Internal function to build the archive.
@@ -546,14 +575,21 @@ async def _build_archive(
     Args:
         mode: Archive mode (accepted but only "standalone" currently implemented)
         expand_coverage: Tile coverage expansion (fetches additional zoom levels if enabled)
+        jobs: Maximum number of tile sources to build in parallel
+        compression: Vector tile compression in PMTiles ("gzip" or "none")
+        executor: Worker pool for parallel PMTiles builds (default: a pool per call)
     """
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
 
         tile_source_infos = []
+        # (safe name, output path, tiles, metadata) per source, built once
+        # every source's tiles (including expanded ones) are known
+        to_build: list[tuple[str, Path, list[tuple], PMTilesMetadata]] = []
         tile_source_results = []
         viewer_tile_sources = []
-        all_coords = []
+        # Per-source (bounds, zoom range), merged for the overall coverage
+        source_coverages = []
         total_tiles = 0
 
         # Process each tile source
@@ -576,21 +612,9 @@ async def _build_archive(
                     f"    Discovered layers: {discovered_layers[:5]}{'...' if len(discovered_layers) > 5 else ''}"
                 )
 
-            # Build PMTiles
-            pmtiles_path = temp_path / f"{safe_name}.pmtiles"
-            builder = PMTilesBuilder(pmtiles_path)
-
-            for coord, content in tiles:
-                builder.add_tile(coord, content)
-                all_coords.append(coord)
-
-            total_tiles += len(tiles)
-
             # Calculate bounds and zoom
             calc = CoverageCalculator()
-            coords = [c for c, _ in tiles]
-            bounds = calc.calculate_bounds(coords)
-            zoom_range = calc.get_zoom_range(coords)
+            bounds, zoom_range = calc.calculate_bounds_and_zoom(c for c, _ in tiles)
 
             # Coverage expansion if requested
             if expand_coverage:
@@ -646,6 +670,11 @@ async def _build_archive(
                                     # Add fetched tiles
                                     if result.new_tiles:
                                         tiles.extend(result.new_tiles)
+                                        # Header, manifest and viewer describe
+                                        # the tiles actually written
+                                        bounds, zoom_range = calc.calculate_bounds_and_zoom(
+                                            c for c, _ in tiles
+                                        )
                                         if verbose:
                                             print(
                                                 f"    ✓ Added {result.fetched_count} tiles to '{source_name}'",
@@ -666,6 +695,9 @@ async def _build_archive(
                         f"    [Warning] No URL pattern available for '{source_name}', cannot expand coverage"
                     )
 
+            total_tiles += len(tiles)
+            source_coverages.append((bounds, zoom_range))
+
             # Get source metadata
             source = processed.tile_sources.get(source_name)
             tile_type = source.tile_type if source else "vector"
@@ -684,8 +716,11 @@ async def _build_archive(
                     for layer_name in discovered_layers
                 ]
 
-            # Set PMTiles metadata
-            builder.set_metadata(
+            # Queue the PMTiles build with its metadata
+            to_build.append((
+                safe_name,
+                temp_path / f"{safe_name}.pmtiles",
+                tiles,
                 PMTilesMetadata(
                     name=safe_name,
                     description=f"Tiles from {capture.metadata.url}",
@@ -695,9 +730,8 @@ async def _build_archive(
                     tile_type=tile_type,
                     format=tile_format,
                     vector_layers=vector_layers_metadata,
-                )
-            )
-            builder.build()
+                ),
+            ))
 
             # Track for packager
             url_pattern = (
@@ -747,11 +781,19 @@ async def _build_archive(
                 }
             )
 
+        # Build the PMTiles archives
+        if verbose and to_build:
+            print(f"  Writing {len(to_build)} PMTiles archives...")
+        built = await _build_pmtiles_sources(
+            [build[1:] for build in to_build], jobs, compression, executor
+        )
+        pmtiles_by_name = {build[0]: pmtiles for build, pmtiles in zip(to_build, built)}
+        to_build.clear()
+
         # Calculate overall bounds
-        if all_coords:
+        if source_coverages:
             calc = CoverageCalculator()
-            overall_bounds = calc.calculate_bounds(all_coords)
-            overall_zoom_range = calc.get_zoom_range(all_coords)
+            overall_bounds, overall_zoom_range = calc.combine_bounds_and_zoom(source_coverages)
         else:
             overall_bounds = GeoBounds(west=-180, south=-90, east=180, north=90)
             overall_zoom_range = (0, 14)
@@ -776,6 +818,8 @@ async def _build_archive(
                 if verbose:
                     print(f"    Rewrote glyphs URL to local path")
 
+            captured_style = prepare_captured_style(captured_style)
+
             if verbose:
                 print("    Style source rewriting complete (see [StyleRewrite] logs for details)")
 
@@ -805,15 +849,18 @@ async def _build_archive(
         packager = ArchivePackager(output_path)
 
         for info in tile_source_infos:
-            pmtiles_path = temp_path / f"{info.name}.pmtiles"
-            packager.add_pmtiles(info.name, pmtiles_path)
+            packager.add_pmtiles(
+                info.name,
+                pmtiles_by_name[info.name],
+                delete_after=True,
+                tiles_compressed=compression == "gzip" or info.tile_type != "vector",
+            )
 
         packager.add_viewer(viewer_html)
 
         # Add captured style if available
         if captured_style:
-            style_json = json.dumps(captured_style, indent=2)
-            packager.temp_files.append(("style/captured_style.json", style_json.encode("utf-8")))
+            packager.temp_files.append(("style/captured_style.json", dumps_indented(captured_style)))
             if verbose:
                 print("  Added captured style to archive")
 
@@ -910,6 +957,49 @@ async def _build_archive(
         )
 
 
+def _build_pmtiles(
+    pmtiles_path: Path,
+    tiles: list[tuple],
+    metadata: PMTilesMetadata,
+    compression: str,
+    in_memory_limit: int | None = None,
+    gzip_threads: int | None = None,
+) -> Path | bytes:
+    """Build one source's PMTiles archive for the packager (picklable for workers)."""
+    builder = PMTilesBuilder(
+        pmtiles_path, tile_compression=compression, gzip_threads=gzip_threads
+    )
+    builder.add_tiles(tiles)
+    builder.set_metadata(metadata)
+    return builder.build_for_archive(in_memory_limit)
+
+
+async def _build_pmtiles_sources(
+    builds: list[tuple[Path, list[tuple], PMTilesMetadata]],
+    jobs: int | None,
+    compression: str = "gzip",
+    executor: Executor | None = None,
+) -> list[Path | bytes]:
+    """
+    Run _build_pmtiles for every (path, tiles, metadata), in order.
+
+    Shares map_builds() with the CLI, so large captures are built in up to
+    `jobs` (default: CPU count) worker processes, on executor if one is
+    given; it blocks, so it runs off the event loop.
+    """
+    return await asyncio.to_thread(
+        map_builds,
+        _build_pmtiles,
+        [
+            (*build, compression, limit)
+            for build, limit in zip(builds, in_memory_limits(tiles for _, tiles, _ in builds))
+        ],
+        sum(len(tiles) for _, tiles, _ in builds),
+        jobs or os.cpu_count() or 1,
+        executor,
+    )
+
+
 def _discover_source_layers(tiles: list[tuple]) -> list[str]:
     """
     Discover source layers from tile content.
@@ -933,7 +1023,7 @@ def _discover_source_layers(tiles: list[tuple]) -> list[str]:
 
         # Decompress if gzipped
         try:
-            if content[:2] == b"\x1f\x8b":
+            if content.startswith(b"\x1f\x8b"):
                 content = gzip.decompress(content)
         except Exception:
             pass
@@ -1054,7 +1144,114 @@ def _entries_to_har_format(entries) -> list[dict]:
 # ============================================================================
 
 
-def validate_pmtiles(path: Path) -> dict:
+def _first_tile_entry(get_bytes, header: dict) -> tuple[int, int, int] | None:
+    """
+    Find the first tile in a PMTiles archive by walking its directories.
+
+    Returns (tile_id, absolute_offset, length), or None for an empty archive.
+    """
+    from pmtiles.tile import deserialize_directory
+
+    dir_offset = header["root_offset"]
+    dir_length = header["root_length"]
+    for _ in range(4):  # max directory depth
+        entries = deserialize_directory(get_bytes(dir_offset, dir_length))
+        if not entries:
+            return None
+        entry = entries[0]
+        if entry.run_length > 0:
+            return entry.tile_id, header["tile_data_offset"] + entry.offset, entry.length
+        # Leaf directory pointer
+        dir_offset = header["leaf_directory_offset"] + entry.offset
+        dir_length = entry.length
+    return None
+
+
+def _validate_mapped(mm: mmap.mmap) -> dict:
+    """Build the validate_pmtiles() report from a mapped PMTiles file."""
+    import gzip
+
+    from pmtiles.tile import TileType, Compression, deserialize_header
+
+    # The header, metadata, directories and one sample tile are plain
+    # slices of the mapping, with no read() call each
+    def get_bytes(offset: int, length: int) -> bytes:
+        return mm[offset:offset + length]
+
+    # Read header (once; Reader.metadata() would parse it again)
+    header = deserialize_header(get_bytes(0, 127))
+
+    # Read metadata
+    try:
+        metadata = get_bytes(header["metadata_offset"], header["metadata_length"])
+        if header["internal_compression"] == Compression.GZIP:
+            metadata = gzip.decompress(metadata)
+        metadata = json.loads(metadata)
+    except Exception:
+        metadata = {}
+
+    # Get a sample tile
+    sample_tile_info = None
+    try:
+        # Try to get the first tile
+        entry = _first_tile_entry(get_bytes, header)
+        if entry:
+            tile_id, tile_offset, tile_length = entry
+
+            # Read tile data
+            tile_data = get_bytes(tile_offset, tile_length)
+            if tile_data:
+                sample_tile_info = {
+                    "tile_id": tile_id,
+                    "offset": tile_offset,
+                    "size": len(tile_data),
+                    "first_10_bytes": tile_data[:10].hex(),
+                    "is_gzipped": tile_data.startswith(b"\x1f\x8b"),
+                }
+    except Exception as e:
+        sample_tile_info = {"error": str(e)}
+
+    # Tile type names
+    tile_type_names = {
+        TileType.UNKNOWN: "Unknown",
+        TileType.MVT: "MVT (Vector)",
+        TileType.PNG: "PNG",
+        TileType.JPEG: "JPEG",
+        TileType.WEBP: "WebP",
+    }
+
+    compression_names = {
+        Compression.UNKNOWN: "Unknown",
+        Compression.NONE: "None",
+        Compression.GZIP: "Gzip",
+        Compression.BROTLI: "Brotli",
+        Compression.ZSTD: "Zstandard",
+    }
+
+    return {
+        "valid": True,
+        "tile_type": tile_type_names.get(header["tile_type"], "Unknown"),
+        "tile_compression": compression_names.get(header["tile_compression"], "Unknown"),
+        "min_zoom": header["min_zoom"],
+        "max_zoom": header["max_zoom"],
+        "bounds": {
+            "west": header["min_lon_e7"] / 1e7,
+            "south": header["min_lat_e7"] / 1e7,
+            "east": header["max_lon_e7"] / 1e7,
+            "north": header["max_lat_e7"] / 1e7,
+        },
+        "center": {
+            "lon": header["center_lon_e7"] / 1e7,
+            "lat": header["center_lat_e7"] / 1e7,
+            "zoom": header["center_zoom"],
+        },
+        "tile_count": header.get("addressed_tiles_count", 0),
+        "metadata": metadata,
+        "sample_tile": sample_tile_info,
+    }
+
+
+def validate_pmtiles(path: Path | mmap.mmap) -> dict:
     """
     Validate a PMTiles file and return diagnostic information.
 
@@ -1062,7 +1259,9 @@ def validate_pmtiles(path: Path) -> dict:
     for debugging loading issues in viewers like pmtiles.io.
 
     Args:
-        path: Path to the PMTiles file
+        path: Path to the PMTiles file, or an open read-only mapping of one.
+            A mapping is left open, so callers checking many files can map
+            each once and reuse it after validation.
 
     Returns:
         Dictionary with diagnostic information including:
@@ -1074,88 +1273,12 @@ def validate_pmtiles(path: Path) -> dict:
         - tile_count: Number of tiles in the archive
         - sample_tile_info: Information about the first tile (for debugging)
     """
-    from pmtiles.reader import Reader
-    from pmtiles.tile import TileType, Compression
-
     try:
-        # Open the file and create a get_bytes function
-        with open(path, "rb") as f:
-            file_data = f.read()
-
-        def get_bytes(offset, length):
-            return file_data[offset : offset + length]
-
-        reader = Reader(get_bytes)
-
-        # Read header
-        header = reader.header()
-
-        # Read metadata
-        try:
-            metadata = json.loads(reader.metadata())
-        except:
-            metadata = {}
-
-        # Get a sample tile
-        sample_tile_info = None
-        try:
-            # Try to get the first tile
-            for entry in reader.entries():
-                tile_id = entry[0]
-                tile_offset = entry[1]
-                tile_length = entry[2]
-
-                # Read tile data
-                tile_data = reader.get_tile(tile_id)
-                if tile_data:
-                    sample_tile_info = {
-                        "tile_id": tile_id,
-                        "size": len(tile_data),
-                        "first_10_bytes": tile_data[:10].hex(),
-                        "is_gzipped": len(tile_data) >= 2 and tile_data[:2] == b"\x1f\x8b",
-                    }
-                    break
-        except Exception as e:
-            sample_tile_info = {"error": str(e)}
-
-        # Tile type names
-        tile_type_names = {
-            TileType.UNKNOWN: "Unknown",
-            TileType.MVT: "MVT (Vector)",
-            TileType.PNG: "PNG",
-            TileType.JPEG: "JPEG",
-            TileType.WEBP: "WebP",
-        }
-
-        compression_names = {
-            Compression.UNKNOWN: "Unknown",
-            Compression.NONE: "None",
-            Compression.GZIP: "Gzip",
-            Compression.BROTLI: "Brotli",
-            Compression.ZSTD: "Zstandard",
-        }
-
-        return {
-            "valid": True,
-            "tile_type": tile_type_names.get(header["tile_type"], "Unknown"),
-            "tile_compression": compression_names.get(header["tile_compression"], "Unknown"),
-            "min_zoom": header["min_zoom"],
-            "max_zoom": header["max_zoom"],
-            "bounds": {
-                "west": header["min_lon_e7"] / 1e7,
-                "south": header["min_lat_e7"] / 1e7,
-                "east": header["max_lon_e7"] / 1e7,
-                "north": header["max_lat_e7"] / 1e7,
-            },
-            "center": {
-                "lon": header["center_lon_e7"] / 1e7,
-                "lat": header["center_lat_e7"] / 1e7,
-                "zoom": header["center_zoom"],
-            },
-            "tile_count": header.get("addressed_tiles_count", 0),
-            "metadata": metadata,
-            "sample_tile": sample_tile_info,
-        }
+        if isinstance(path, mmap.mmap):
+            return _validate_mapped(path)
+        # Map the file rather than reading it whole, and unmap it once done
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _validate_mapped(mm)
     except Exception as e:
         return {
             "valid": False,
@@ -10,11 +10,25 @@ Key requirements:
 from pathlib import Path
 from datetime import datetime
 import zipfile
+import gzip
+import io
 import json
+import shutil
 from dataclasses import dataclass, asdict
 
 from ..tiles.coverage import GeoBounds
 
+# Optional: orjson for serializing the manifest and JSON side files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Chunk size for copying files from disk into the ZIP; zipfile's own
+# write() copies 8 KiB at a time
+_COPY_BUFFER_SIZE = 1024 * 1024
+
 
 @dataclass
 class TileSourceInfo:
@@ -107,6 +121,17 @@ class ArchiveManifest:
         return result
 
 
+def dumps_indented(obj) -> bytes:
+    """Serialize obj as 2-space indented UTF-8 JSON, via orjson when installed."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # e.g. non-str dict keys; the stdlib encoder coerces those
+            pass
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
 class ArchivePackager:
     """Package map archive into a ZIP file."""
 
@@ -116,15 +141,53 @@ class ArchivePackager:
         self.output_path = Path(output_path)
         self.temp_files: list[tuple[str, Path | bytes]] = []
         self.manifest: ArchiveManifest | None = None
+        # Archive paths written uncompressed (content is already compressed)
+        self.stored_paths: set[str] = set()
+        # Staged files deleted as soon as they've been copied into the ZIP
+        self.consumed_files: set[Path] = set()
+
+    def add_pmtiles(
+        self,
+        name: str,
+        pmtiles: Path | bytes,
+        delete_after: bool = False,
+        tiles_compressed: bool = True,
+    ) -> None:
+        """
+        Add a PMTiles archive, given as a file path or in-memory bytes.
 
-    def add_pmtiles(self, name: str, pmtiles_path: Path) -> None:
-        """Add a PMTiles file to the archive."""
+        With delete_after, a file path is removed once build() has copied
+        it, so it doesn't sit on disk next to its copy in the archive.
+        tiles_compressed says whether the tiles inside are already
+        compressed (gzipped vector or PNG/JPEG/WebP raster tiles).
+        """
         archive_path = f"tiles/{name}.pmtiles"
-        self.temp_files.append((archive_path, pmtiles_path))
+        self.temp_files.append((archive_path, pmtiles))
+        if delete_after and isinstance(pmtiles, Path):
+            self.consumed_files.add(pmtiles)
+        if tiles_compressed:
+            # Deflating already-compressed tiles again costs CPU for next
+            # to no size reduction; uncompressed vector tiles are deflated
+            self.stored_paths.add(archive_path)
+
+    def add_viewer(self, html_content: str, precompress: bool = True) -> None:
+        """
+        Add the viewer HTML to the archive.
 
-    def add_viewer(self, html_content: str) -> None:
-        """Add the viewer HTML to the archive."""
-        self.temp_files.append(("viewer.html", html_content.encode('utf-8')))
+        With precompress, a gzipped copy is added too (viewer.html.gz),
+        for servers that can send it with Content-Encoding: gzip. It is
+        stored rather than deflated again, and mtime=0 keeps it
+        byte-identical across runs, like ViewerGenerator.write().
+        """
+        html_bytes = html_content.encode('utf-8')
+        self.temp_files.append(("viewer.html", html_bytes))
+        if precompress:
+            buf = io.BytesIO()
+            with gzip.GzipFile(filename='', mode='wb', fileobj=buf,
+                               compresslevel=9, mtime=0) as gz:
+                gz.write(html_bytes)
+            self.temp_files.append(("viewer.html.gz", buf.getvalue()))
+            self.stored_paths.add("viewer.html.gz")
 
     def set_manifest(
         self,
@@ -170,12 +233,30 @@ class ArchivePackager:
 
         with zipfile.ZipFile(self.output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
             # Add manifest
-            manifest_json = json.dumps(self.manifest.to_dict(), indent=2)
-            zf.writestr("manifest.json", manifest_json)
+            zf.writestr("manifest.json", self._manifest_json())
 
             # Add all files
             for archive_path, content in self.temp_files:
+                compress_type = (
+                    zipfile.ZIP_STORED if archive_path in self.stored_paths else zf.compression
+                )
                 if isinstance(content, Path):
-                    zf.write(content, archive_path)
+                    self._write_file(zf, content, archive_path, compress_type)
+                    if content in self.consumed_files:
+                        content.unlink()
                 else:
-                    zf.writestr(archive_path, content)
+                    zf.writestr(archive_path, content, compress_type=compress_type)
+
+    def _manifest_json(self) -> bytes:
+        """Serialize the manifest as 2-space indented JSON."""
+        return dumps_indented(self.manifest.to_dict())
+
+    @staticmethod
+    def _write_file(
+        zf: zipfile.ZipFile, path: Path, archive_path: str, compress_type: int
+    ) -> None:
+        """Copy a file from disk into the ZIP in large chunks."""
+        zinfo = zipfile.ZipInfo.from_file(path, archive_path)
+        zinfo.compress_type = compress_type
+        with open(path, 'rb') as src, zf.open(zinfo, 'w') as dst:
+            shutil.copyfileobj(src, dst, _COPY_BUFFER_SIZE)
@@ -126,13 +126,12 @@ def process_capture_bundle(bundle: CaptureBundle) -> ProcessedCapture:
         )
     else:
         # Calculate from tiles
-        all_coords = []
-        for coords_list in tiles_by_source.values():
-            all_coords.extend([c for c, _ in coords_list])
-
-        if all_coords:
+        # Stream the coordinates rather than collecting them in a list
+        if any(tiles_by_source.values()):
             calc = CoverageCalculator()
-            bounds = calc.calculate_bounds(all_coords)
+            bounds = calc.calculate_bounds(
+                c for coords_list in tiles_by_source.values() for c, _ in coords_list
+            )
         else:
             # Fallback to viewport center
             lng, lat = bundle.viewport.center
@@ -186,12 +185,12 @@ def _infer_tile_type(url: str, data: bytes) -> str:
 
     # Check content magic bytes
     if data:
-        if data[:8] == b'\x89PNG\r\n\x1a\n':
+        if data.startswith(b'\x89PNG\r\n\x1a\n'):
             return 'raster'
-        if data[:2] == b'\xff\xd8':  # JPEG
+        if data.startswith(b'\xff\xd8'):  # JPEG
             return 'raster'
         # Assume vector for gzipped/protobuf content
-        if data[:2] == b'\x1f\x8b':  # gzip
+        if data.startswith(b'\x1f\x8b'):  # gzip
             return 'vector'
 
     return 'vector'  # Default to vector
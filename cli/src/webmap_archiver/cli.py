@@ -3,6 +3,7 @@ Command-line interface for webmap-archiver.
 
 Commands:
 - create: Create archive from HAR file
+- process: Create archive from a capture bundle (JSON)
 - inspect: Analyze HAR file without creating archive
 - capture-style-help: Show instructions for capturing map style
 """
@@ -11,29 +12,276 @@ import click
 from pathlib import Path
 from datetime import datetime
 import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from collections import Counter
+from contextlib import nullcontext
 from enum import Enum
+import multiprocessing
+import os
+import re
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 import tempfile
 import shutil
 
-from .har.parser import HARParser
+from .har.parser import HARParser, COMPRESSED_HAR_SUFFIXES
 from .har.classifier import RequestClassifier, RequestType
-from .tiles.detector import TileDetector
-from .tiles.coverage import CoverageCalculator
-from .tiles.pmtiles import PMTilesBuilder, PMTilesMetadata
+from .tiles.detector import TileCoord, TileDetector, TileSource
+from .tiles.coverage import CoverageCalculator, GeoBounds
+from .tiles.pmtiles import (
+    PMTilesBuilder, PMTilesMetadata, VECTOR_TILE_COMPRESSIONS, in_memory_limits, map_builds,
+)
 from .tiles.layer_inspector import discover_layers_from_tiles, get_primary_layer_name
-from .styles.extractor import extract_styles_from_har
+from .styles.extractor import StyleExtractionReport, extract_styles_from_har, is_script_entry
 from .viewer.generator import ViewerGenerator, ViewerConfig
-from .archive.packager import ArchivePackager, TileSourceInfo
+from .archive.packager import ArchivePackager, TileSourceInfo, dumps_indented
 from .site.extractor import SiteExtractor
 from .resources.bundler import SpriteBundler, GlyphBundler, extract_all_resources
-from .capture.parser import CaptureParser, validate_capture_bundle
-from .capture.processor import process_capture_bundle
+
+# Optional: orjson for loading style override and bundle JSON
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 console = Console()
 
+# Tile source names from these providers are treated as basemaps, not data
+_BASEMAP_RE = re.compile(r'maptiler|mapbox|esri|osm', re.IGNORECASE)
+
+# Source-name parts too generic to match a source to a tile URL by
+_SKIP_NAME_PARTS = frozenset({'pbf', 'mvt', 'tiles', 'api', 'v1', 'v2', 'v3', 'v4'})
+
+
+def _load_json(path: Path):
+    """Load a JSON file, parsing with orjson when installed."""
+    data = Path(path).read_bytes()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _status(message: str, verbose: bool):
+    """
+    Spinner for a long create() step, shown only with --verbose.
+
+    console.status() runs a refresh thread that keeps redrawing the
+    terminal; by default each step's summary line is feedback enough.
+    """
+    return console.status(message) if verbose else nullcontext()
+
+
+class _LazyProcessPool(Executor):
+    """
+    A spawn-context process pool that starts on first submit().
+
+    One pool is shared by every parallel step of a command, so workers
+    are spawned once rather than per step; a command whose steps all stay
+    under their parallel thresholds never starts one.
+    """
+
+    def __init__(self, max_workers: int):
+        self._max_workers = max_workers
+        self._pool: ProcessPoolExecutor | None = None
+
+    def submit(self, fn, /, *args, **kwargs):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def _command_pool(jobs: int) -> Executor:
+    """A lazily started worker pool, shut down when the command exits (even on Abort)."""
+    return click.get_current_context().with_resource(_LazyProcessPool(jobs))
+
+
+def _walk_files(root: Path, base: Path) -> list[tuple[str, Path]]:
+    """
+    List (path relative to base, path) for every file under root.
+
+    One os.scandir() pass: the entry type comes from the directory
+    listing, so files aren't stat()ed again as rglob() + is_file() would.
+    Directories are visited in the same order as rglob('*').
+    """
+    files = []
+    pending = [(root, os.path.relpath(root, base))]
+    while pending:
+        directory, rel_dir = pending.pop()
+        subdirs = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir():
+                    subdirs.append((entry.path, os.path.join(rel_dir, entry.name)))
+                elif entry.is_file():
+                    files.append((os.path.join(rel_dir, entry.name), Path(entry.path)))
+        # Reversed onto the stack so the first subdirectory is walked next
+        pending.extend(reversed(subdirs))
+    return files
+
+
+def _asset_kind(mime_type: str) -> str:
+    """Bucket an extracted site asset by MIME type for the summary line."""
+    if mime_type == 'text/html':
+        return 'html'
+    if mime_type == 'text/css':
+        return 'css'
+    if 'javascript' in mime_type:
+        return 'js'
+    return 'other'
+
+
+def _asset_type_summary(assets) -> str:
+    """Count extracted site assets by kind in one pass and format the counts."""
+    counts = Counter(_asset_kind(a.mime_type) for a in assets)
+    return (
+        f"HTML: {counts['html']}, CSS: {counts['css']}, "
+        f"JS: {counts['js']}, Other: {counts['other']}"
+    )
+
+
+def _identifying_parts(source_name: str) -> list[str]:
+    """Split a source name into the parts used to match it against tile URLs."""
+    source_parts = source_name.lower().replace('-', ' ').replace('_', ' ').replace('.', ' ').split()
+    return [p for p in source_parts if p not in _SKIP_NAME_PARTS and len(p) > 2]
+
+
+def _match_override_source(
+    source_name: str, override_ids: list[tuple[str, str]]
+) -> str | None:
+    """
+    Find the style-override source id that matches a tile source name.
+
+    override_ids holds (source id, lowercased source id) pairs, lowercased
+    once by the caller rather than once per tile source. An id matches if
+    either name contains the other, or if any dash-separated part of the
+    source name (3+ chars) appears in it.
+    """
+    name = source_name.lower()
+    name_parts = [part for part in name.split('-') if len(part) > 2]
+    for source_id, id_lower in override_ids:
+        if id_lower in name or name in id_lower or any(part in id_lower for part in name_parts):
+            return source_id
+    return None
+
+
+def _build_one_source(
+    source: TileSource,
+    tiles: list[tuple[TileCoord, bytes]],
+    temp_dir: Path,
+    coverage: tuple[GeoBounds, tuple[int, int]] | None = None,
+    compression: str = "gzip",
+    in_memory_limit: int | None = None,
+    gzip_threads: int | None = None,
+) -> tuple[str, Path | bytes, TileSourceInfo, list[str] | None]:
+    """
+    Build the PMTiles archive for one tile source.
+
+    Module-level (and free of console output) so create() can run it in
+    worker processes. coverage is the (bounds, zoom range) of tiles when
+    the caller already has it; compression applies to vector tiles.
+    in_memory_limit is passed to build_for_archive(), and gzip_threads
+    sizes the builder's (de)compression thread pool.
+    Returns (source name, PMTiles path or bytes, info, discovered layer
+    names or None for raster sources).
+    """
+    builder = PMTilesBuilder(temp_dir / f"{source.name}.pmtiles", compression, gzip_threads)
+    builder.add_tiles(tiles)
+
+    if coverage is None:
+        coverage = CoverageCalculator().calculate_bounds_and_zoom(t[0] for t in tiles)
+    source_bounds, source_zoom = coverage
+
+    # Discover layer names from tile content BEFORE building (for vector tiles)
+    layer_names = None
+    vector_layers_metadata = None
+    if source.tile_type == "vector":
+        layer_names = discover_layers_from_tiles(tiles)
+        if layer_names:
+            # Format as TileJSON vector_layers spec
+            vector_layers_metadata = [
+                {
+                    "id": layer_name,
+                    "fields": {},  # Could be enhanced to discover fields
+                    "minzoom": source_zoom[0],
+                    "maxzoom": source_zoom[1],
+                }
+                for layer_name in layer_names
+            ]
+
+    builder.set_metadata(PMTilesMetadata(
+        name=source.name,
+        description=f"Tiles from {source.url_template}",
+        bounds=source_bounds,
+        min_zoom=source_zoom[0],
+        max_zoom=source_zoom[1],
+        tile_type=source.tile_type,
+        format=source.format,
+        vector_layers=vector_layers_metadata,
+    ))
+
+    info = TileSourceInfo(
+        name=source.name,
+        path=f"tiles/{source.name}.pmtiles",
+        tile_type=source.tile_type,
+        format=source.format,
+        tile_count=len(tiles),
+        zoom_range=source_zoom,
+    )
+    return source.name, builder.build_for_archive(in_memory_limit), info, layer_names
+
+
+def _build_sources(
+    to_build: list[tuple[TileSource, list[tuple[TileCoord, bytes]]]],
+    temp_dir: Path,
+    jobs: int,
+    verbose: bool,
+    coverages: list[tuple[GeoBounds, tuple[int, int]] | None] | None = None,
+    compression: str = "gzip",
+    executor: Executor | None = None,
+) -> list[tuple[str, Path | bytes, TileSourceInfo, list[str] | None]]:
+    """
+    Run _build_one_source for every (source, tiles) pair, in source order.
+
+    coverages, if given, holds each source's precomputed coverage (or None
+    to compute it), in the same order as to_build. Large jobs are built in
+    worker processes by map_builds(), on executor if one is given.
+    """
+    if coverages is None:
+        coverages = [None] * len(to_build)
+    limits = in_memory_limits(t for _, t in to_build)
+    with _status(f"Writing {len(to_build)} PMTiles archives...", verbose):
+        return map_builds(
+            _build_one_source,
+            [
+                (source, t, temp_dir, coverage, compression, limit)
+                for (source, t), coverage, limit in zip(to_build, coverages, limits)
+            ],
+            sum(len(t) for _, t in to_build),
+            jobs,
+            executor,
+        )
+
+
+def _print_built_source(
+    source_name: str, info: TileSourceInfo, layer_names: list[str] | None
+) -> None:
+    """Print the summary lines for one built PMTiles source."""
+    if layer_names is not None:
+        if layer_names:
+            console.print(f"  ✓ {source_name}: discovered layers [cyan]{', '.join(layer_names)}[/]")
+        else:
+            console.print(f"  [yellow]⚠ {source_name}: could not discover layer names from tile content[/]")
+    console.print(f"  ✓ Created {source_name}.pmtiles ({info.tile_count} tiles)")
+
 
 class ArchiveMode(str, Enum):
     """Archive output modes."""
@@ -42,6 +290,11 @@ class ArchiveMode(str, Enum):
     FULL = "full"              # both standalone and original
 
 
+# Modes that include the standalone viewer / the preserved original site
+_VIEWER_MODES = frozenset({ArchiveMode.STANDALONE, ArchiveMode.FULL})
+_ORIGINAL_MODES = frozenset({ArchiveMode.ORIGINAL, ArchiveMode.FULL})
+
+
 def build_archive_from_tiles(
     tile_sources: dict[str, any],  # source_name -> TileSource
     tiles_by_source: dict[str, list[tuple[any, bytes]]],  # source_name -> [(coord, content)]
@@ -54,77 +307,40 @@ def build_archive_from_tiles(
     har_entries: list | None = None,
     capture_metadata: dict | None = None,
     verbose: bool = False,
+    jobs: int | None = None,
+    compression: str = "gzip",
+    executor: Executor | None = None,
 ) -> None:
     """
     Build an archive from processed tile data.
 
     Shared between `create` (from HAR) and `process` (from capture bundle).
+    Up to `jobs` tile sources (default: CPU count) are built in parallel,
+    on `executor` if given; vector tiles are stored with `compression`
+    ("gzip" or "none").
     """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
     temp_dir = Path(tempfile.mkdtemp())
-    pmtiles_files: list[tuple[str, Path, TileSourceInfo]] = []
+    pmtiles_files: list[tuple[str, Path | bytes, TileSourceInfo]] = []
     discovered_layers: dict[str, list[str]] = {}
 
-    coverage_calc = CoverageCalculator()
-
     # Step 1: Build PMTiles for each source
+    to_build = []
     for source_name, source in tile_sources.items():
         tiles = tiles_by_source.get(source_name, [])
-        if not tiles:
-            continue
-
-        console.print(f"Building PMTiles for [cyan]{source_name}[/]...")
-
-        pmtiles_path = temp_dir / f"{source_name}.pmtiles"
-        builder = PMTilesBuilder(pmtiles_path)
-
-        for coord, content in tiles:
-            builder.add_tile(coord, content)
+        if tiles:
+            console.print(f"Building PMTiles for [cyan]{source_name}[/]...")
+            to_build.append((source, tiles))
 
-        coords = [t[0] for t in tiles]
-        source_bounds = coverage_calc.calculate_bounds(coords)
-        source_zoom = coverage_calc.get_zoom_range(coords)
-
-        # Discover layer names from tile content BEFORE building (for vector tiles)
-        vector_layers_metadata = None
-        if source.tile_type == "vector":
-            layer_names = discover_layers_from_tiles(tiles)
+    built = _build_sources(
+        to_build, temp_dir, jobs, verbose, compression=compression, executor=executor
+    )
+    for source_name, pmtiles, info, layer_names in built:
+        if layer_names is not None:
             discovered_layers[source_name] = layer_names
-            if layer_names:
-                console.print(f"  ✓ Discovered layers: [cyan]{', '.join(layer_names)}[/]")
-                # Format as TileJSON vector_layers spec
-                vector_layers_metadata = [
-                    {
-                        "id": layer_name,
-                        "fields": {},  # Could be enhanced to discover fields
-                        "minzoom": source_zoom[0],
-                        "maxzoom": source_zoom[1],
-                    }
-                    for layer_name in layer_names
-                ]
-
-        builder.set_metadata(PMTilesMetadata(
-            name=source_name,
-            description=f"Tiles from {source.url_template}",
-            bounds=source_bounds,
-            min_zoom=source_zoom[0],
-            max_zoom=source_zoom[1],
-            tile_type=source.tile_type,
-            format=source.format,
-            vector_layers=vector_layers_metadata,
-        ))
-
-        builder.build()
-
-        info = TileSourceInfo(
-            name=source_name,
-            path=f"tiles/{source_name}.pmtiles",
-            tile_type=source.tile_type,
-            format=source.format,
-            tile_count=len(tiles),
-            zoom_range=source_zoom,
-        )
-        pmtiles_files.append((source_name, pmtiles_path, info))
-        console.print(f"  ✓ Created {pmtiles_path.name} ({len(tiles)} tiles)")
+        pmtiles_files.append((source_name, pmtiles, info))
+        _print_built_source(source_name, info, layer_names)
 
     console.print()
 
@@ -132,7 +348,7 @@ def build_archive_from_tiles(
     extracted_assets = []
     site_dir = None
 
-    if archive_mode in (ArchiveMode.ORIGINAL, ArchiveMode.FULL) and har_entries:
+    if archive_mode in _ORIGINAL_MODES and har_entries:
         console.print("Extracting original site assets...")
 
         # Detect base URL from HAR
@@ -153,19 +369,15 @@ def build_archive_from_tiles(
             console.print(f"  ✓ Extracted [cyan]{len(extracted_assets)}[/] site assets")
 
             if verbose:
-                html_count = sum(1 for a in extracted_assets if a.mime_type == 'text/html')
-                css_count = sum(1 for a in extracted_assets if a.mime_type == 'text/css')
-                js_count = sum(1 for a in extracted_assets if 'javascript' in a.mime_type)
-                other_count = len(extracted_assets) - html_count - css_count - js_count
-                console.print(f"    HTML: {html_count}, CSS: {css_count}, JS: {js_count}, Other: {other_count}")
+                console.print(f"    {_asset_type_summary(extracted_assets)}")
         else:
             console.print("  [yellow]⚠ No site assets found to extract[/]")
 
         console.print()
 
     # Step 3: Extract map resources (sprites, glyphs) from HAR if available
-    resources_dir = temp_dir / "resources"
-    resources_dir.mkdir(exist_ok=True)
+    # (kept in memory as (archive_path, bytes) until packaging)
+    resource_files: list[tuple[str, bytes]] = []
 
     sprite_path = None
     glyphs_path = None
@@ -176,8 +388,7 @@ def build_archive_from_tiles(
         sprite_bundle, glyph_bundle = extract_all_resources(har_entries)
 
         if sprite_bundle.has_sprites:
-            sprites_dir = resources_dir / "sprites"
-            sprite_bundle.write_to_directory(sprites_dir)
+            resource_files.extend(sprite_bundle.iter_entries("resources/sprites"))
             sprite_path = "resources/sprites/sprite"
             console.print(f"  ✓ Extracted sprites")
             if verbose:
@@ -187,8 +398,8 @@ def build_archive_from_tiles(
             console.print("  [dim]No sprites found in HAR[/]")
 
         if glyph_bundle.has_glyphs:
-            glyphs_dir = resources_dir / "glyphs"
-            written = glyph_bundle.write_to_directory(glyphs_dir)
+            resource_files.extend(glyph_bundle.iter_entries("resources/glyphs"))
+            written = glyph_bundle.range_counts()
             glyphs_path = "resources/glyphs/{fontstack}/{range}.pbf"
             console.print(f"  ✓ Extracted glyphs for [cyan]{len(written)}[/] font stacks")
             if verbose:
@@ -223,7 +434,7 @@ def build_archive_from_tiles(
         # Get all tile URLs for matching
         detected_urls = [source.url_template for source in tile_sources.values()]
 
-        extracted_style_report = extract_styles_from_har(har_entries, detected_urls)
+        extracted_style_report = extract_styles_from_har(har_entries, detected_urls, jobs, executor)
 
         if extracted_style_report.extracted_layers:
             console.print(f"  ✓ Extracted styling for [cyan]{len(extracted_style_report.extracted_layers)}[/] layers")
@@ -239,12 +450,19 @@ def build_archive_from_tiles(
     console.print("Generating viewer...")
     viewer_gen = ViewerGenerator()
 
-    BASEMAP_DOMAINS = ['maptiler', 'mapbox', 'esri', 'osm']
+    # Lowercase override source ids and extracted layer tile URLs once,
+    # not once per tile source
+    override_ids = [(source_id, source_id.lower()) for source_id in override_layers_by_source]
+    layer_urls = [
+        (layer, layer.tile_url.lower())
+        for layer in extracted_style_report.extracted_layers
+        if layer.tile_url
+    ] if extracted_style_report else []
 
     tile_source_configs = []
     for _, _, info in pmtiles_files:
         # Detect if this is likely a basemap vs data layer
-        is_basemap = any(domain in info.name.lower() for domain in BASEMAP_DOMAINS)
+        is_basemap = _BASEMAP_RE.search(info.name) is not None
 
         # Get discovered layer names for this source
         source_layers = discovered_layers.get(info.name, [])
@@ -254,15 +472,11 @@ def build_archive_from_tiles(
 
         # Check if we have override layers for this source
         override_layers = None
-        if override_layers_by_source:
-            for override_source_id in override_layers_by_source.keys():
-                if (override_source_id.lower() in info.name.lower() or
-                    info.name.lower() in override_source_id.lower() or
-                    any(part in override_source_id.lower() for part in info.name.lower().split('-') if len(part) > 2)):
-                    override_layers = override_layers_by_source[override_source_id]
-                    if verbose:
-                        console.print(f"  ✓ Found {len(override_layers)} override layers for {info.name}")
-                    break
+        override_source_id = _match_override_source(info.name, override_ids)
+        if override_source_id is not None:
+            override_layers = override_layers_by_source[override_source_id]
+            if verbose:
+                console.print(f"  ✓ Found {len(override_layers)} override layers for {info.name}")
 
         if override_layers:
             extracted_style_config = {
@@ -276,18 +490,13 @@ def build_archive_from_tiles(
         elif extracted_style_report or source_layers or not is_basemap:
             # Find extracted styling for this source
             extracted_style = None
-            if extracted_style_report:
-                for layer in extracted_style_report.extracted_layers:
-                    if layer.tile_url:
-                        source_parts = info.name.lower().replace('-', ' ').replace('_', ' ').replace('.', ' ').split()
-                        url_lower = layer.tile_url.lower()
-                        skip_parts = {'pbf', 'mvt', 'tiles', 'api', 'v1', 'v2', 'v3', 'v4'}
-                        identifying_parts = [p for p in source_parts if p not in skip_parts and len(p) > 2]
-                        matches = sum(1 for part in identifying_parts if part in url_lower)
-                        match_ratio = matches / len(identifying_parts) if identifying_parts else 0
-                        if match_ratio >= 0.5:
-                            extracted_style = layer
-                            break
+            identifying_parts = _identifying_parts(info.name)
+            for layer, url_lower in layer_urls:
+                matches = sum(1 for part in identifying_parts if part in url_lower)
+                match_ratio = matches / len(identifying_parts) if identifying_parts else 0
+                if match_ratio >= 0.5:
+                    extracted_style = layer
+                    break
 
             primary_source_layer = None
             if source_layers:
@@ -325,12 +534,15 @@ def build_archive_from_tiles(
     console.print("Packaging archive...")
     packager = ArchivePackager(output_path)
 
-    for name_, pmtiles_path, info in pmtiles_files:
-        packager.add_pmtiles(name_, pmtiles_path)
+    for name_, pmtiles, info in pmtiles_files:
+        packager.add_pmtiles(
+            name_, pmtiles, delete_after=True,
+            tiles_compressed=compression == "gzip" or info.tile_type != "vector",
+        )
 
     # Write extracted styles if available
     if extracted_style_report:
-        extracted_styles_json = json.dumps({
+        extracted_styles_json = dumps_indented({
             "extraction_report": extracted_style_report.to_manifest_section(),
             "layers": [
                 {
@@ -346,20 +558,17 @@ def build_archive_from_tiles(
                 for layer in extracted_style_report.extracted_layers
             ],
             "_comment": "This file documents extracted styling. Edit to refine layer appearance."
-        }, indent=2)
-        packager.temp_files.append(("style/extracted_layers.json", extracted_styles_json.encode('utf-8')))
+        })
+        packager.temp_files.append(("style/extracted_layers.json", extracted_styles_json))
 
     # Add viewer HTML (for standalone and full modes)
-    if archive_mode in (ArchiveMode.STANDALONE, ArchiveMode.FULL):
+    if archive_mode in _VIEWER_MODES:
         packager.add_viewer(viewer_html)
         console.print("  ✓ Added standalone viewer")
 
     # Add original site files (for original and full modes)
-    if archive_mode in (ArchiveMode.ORIGINAL, ArchiveMode.FULL) and site_dir and site_dir.exists():
-        for file_path in site_dir.rglob('*'):
-            if file_path.is_file():
-                rel_path = file_path.relative_to(temp_dir)
-                packager.temp_files.append((str(rel_path), file_path))
+    if archive_mode in _ORIGINAL_MODES and site_dir and site_dir.exists():
+        packager.temp_files.extend(_walk_files(site_dir, temp_dir))
 
         console.print(f"  ✓ Added original site ({len(extracted_assets)} files)")
 
@@ -372,30 +581,23 @@ def build_archive_from_tiles(
             console.print("  [yellow]⚠ serve.py template not found[/]")
 
     # Add resources (sprites, glyphs)
-    if resources_dir.exists():
-        for file_path in resources_dir.rglob('*'):
-            if file_path.is_file():
-                rel_path = file_path.relative_to(temp_dir)
-                packager.temp_files.append((str(rel_path), file_path))
-
-        resource_count = sum(1 for _ in resources_dir.rglob('*') if _.is_file())
-        if resource_count > 0:
-            console.print(f"  ✓ Added map resources ({resource_count} files)")
+    if resource_files:
+        packager.temp_files.extend(resource_files)
+        console.print(f"  ✓ Added map resources ({len(resource_files)} files)")
 
     # Add captured style if provided
     if override_style:
-        style_json = json.dumps(override_style, indent=2)
-        packager.temp_files.append(("style/captured_style.json", style_json.encode('utf-8')))
+        packager.temp_files.append(("style/captured_style.json", dumps_indented(override_style)))
         console.print("  ✓ Added captured style")
 
     # Prepare manifest
     original_site_info = None
-    if archive_mode in (ArchiveMode.ORIGINAL, ArchiveMode.FULL) and extracted_assets:
+    if archive_mode in _ORIGINAL_MODES and extracted_assets:
         original_site_info = {
             "available": True,
             "entry_point": "original/index.html",
             "file_count": len(extracted_assets),
-            "total_size_bytes": sum(len(a.content) for a in extracted_assets)
+            "total_size_bytes": sum(a.size for a in extracted_assets)
         }
 
     # Get original tile URLs for manifest
@@ -461,10 +663,14 @@ def main():
               help='Expand coverage by N additional zoom levels (implies --expand-coverage)')
 @click.option('--rate-limit', type=float, default=10.0,
               help='Rate limit for tile fetching (requests per second, default: 10)')
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=lambda: os.cpu_count() or 1,
+              help='Number of tile sources to build in parallel (default: CPU count)')
+@click.option('--compression', type=click.Choice(VECTOR_TILE_COMPRESSIONS), default='gzip',
+              help='Vector tile compression in PMTiles (default: gzip; raster tiles are stored as-is)')
 def create(har_file: Path, output: Path | None, name: str | None, verbose: bool, 
            style_override: Path | None, mode: str, expand_coverage: bool, 
-           expand_zoom: int, rate_limit: float):
-    """Create an archive from a HAR file.
+           expand_zoom: int, rate_limit: float, jobs: int, compression: str):
+    """Create an archive from a HAR file (.har, .har.gz or .har.zst).
     
     Archive modes:
     
@@ -492,63 +698,90 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
                         what was captured. Implies --expand-coverage.
     """
     archive_mode = ArchiveMode(mode)
+    # Worker pool shared by the PMTiles build and the JavaScript scan
+    executor = _command_pool(jobs)
     
     # --expand-zoom implies --expand-coverage
     if expand_zoom > 0:
         expand_coverage = True
 
-    # Set defaults
+    # Set defaults (from the HAR inside a .gz/.zst file, if compressed)
+    har_name = har_file.with_suffix('') if har_file.suffix.lower() in COMPRESSED_HAR_SUFFIXES else har_file
     if output is None:
-        output = har_file.with_suffix('.zip')
+        output = har_name.with_suffix('.zip')
     if name is None:
-        name = har_file.stem.replace('_', ' ').replace('-', ' ').replace('.', ' ').title()
+        name = har_name.stem.replace('_', ' ').replace('-', ' ').replace('.', ' ').title()
 
     console.print(f"[bold]Creating archive from:[/] {har_file}")
     console.print(f"[bold]Output:[/] {output}")
     console.print(f"[bold]Mode:[/] {archive_mode.value}")
     console.print()
 
-    # Step 1: Parse HAR
-    with console.status("Parsing HAR file..."):
+    # Steps 1-3: Parse the HAR, classify requests, detect tile sources and
+    # collect scripts for style extraction in a single pass, as entries
+    # stream out of the parser
+    with _status("Parsing HAR file and detecting tile sources...", verbose):
         parser = HARParser(har_file)
-        entries = parser.parse()
-    console.print(f"  Parsed [cyan]{len(entries)}[/] entries")
-
-    # Step 2: Classify requests
-    with console.status("Classifying requests..."):
         classifier = RequestClassifier()
-        grouped = classifier.classify_all(entries)
+        detector = TileDetector()
+        entries = []
+        vector_count = 0
+        raster_count = 0
+        detected = []
+        script_entries = []
 
-    vector_tiles = grouped[RequestType.VECTOR_TILE]
-    raster_tiles = grouped[RequestType.RASTER_TILE]
-    console.print(f"  Found [cyan]{len(vector_tiles)}[/] vector tiles, [cyan]{len(raster_tiles)}[/] raster tiles")
+        # Hoist enum members and bound methods out of the per-entry loop
+        VECTOR_TILE, RASTER_TILE = RequestType.VECTOR_TILE, RequestType.RASTER_TILE
+        classify = classifier.classify
+        detect = detector.detect
 
-    if not vector_tiles and not raster_tiles:
-        console.print("[red]No tiles found in HAR file![/]")
-        raise click.Abort()
+        for entry in parser.iter_entries_prefetched():
+            entries.append(entry)
 
-    # Step 3: Detect tile sources
-    with console.status("Detecting tile sources..."):
-        detector = TileDetector()
-        detected = []
+            if is_script_entry(entry):
+                script_entries.append(entry)
+
+            # Same filter as RequestClassifier.classify_all
+            if not (entry.is_successful and entry.has_content):
+                continue
 
-        for entry in vector_tiles + raster_tiles:
-            tile = detector.detect(entry.url, entry.content)
+            request_type = classify(entry).request_type
+            if request_type is VECTOR_TILE:
+                vector_count += 1
+            elif request_type is RASTER_TILE:
+                raster_count += 1
+            else:
+                continue
+
+            tile = detect(entry.url, entry.content)
             if tile:
                 detected.append(tile)
 
-        sources = detector.group_by_source(detected)
+    console.print(f"  Parsed [cyan]{len(entries)}[/] entries")
+    console.print(f"  Found [cyan]{vector_count}[/] vector tiles, [cyan]{raster_count}[/] raster tiles")
+
+    if not vector_count and not raster_count:
+        console.print("[red]No tiles found in HAR file![/]")
+        raise click.Abort()
+
+    sources = detector.group_by_source(detected)
+    # Grouping holds the same (coord, content) pairs; drop the per-tile
+    # DetectedTile wrappers
+    del detected
 
     console.print(f"  Detected [cyan]{len(sources)}[/] tile sources:")
     for template, (source, tiles) in sources.items():
         console.print(f"    • {source.name}: {len(tiles)} tiles ({source.tile_type})")
     console.print()
 
-    # Step 4: Calculate coverage
+    # Step 4: Calculate coverage per source, then merge the per-source
+    # results; Step 5 reuses them instead of rescanning each source
     coverage_calc = CoverageCalculator()
-    all_coords = [t[0] for tiles in sources.values() for t in tiles[1]]
-    bounds = coverage_calc.calculate_bounds(all_coords)
-    zoom_range = coverage_calc.get_zoom_range(all_coords)
+    source_coverage = {
+        template: coverage_calc.calculate_bounds_and_zoom(t[0] for t in tiles)
+        for template, (_, tiles) in sources.items()
+    }
+    bounds, zoom_range = coverage_calc.combine_bounds_and_zoom(source_coverage.values())
 
     console.print(f"[bold]Coverage:[/]")
     console.print(f"  Bounds: {bounds.west:.4f}, {bounds.south:.4f} to {bounds.east:.4f}, {bounds.north:.4f}")
@@ -557,7 +790,7 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
 
     # Step 5: Build PMTiles for each source (with optional coverage expansion)
     temp_dir = Path(tempfile.mkdtemp())
-    pmtiles_files: list[tuple[str, Path, TileSourceInfo]] = []
+    pmtiles_files: list[tuple[str, Path | bytes, TileSourceInfo]] = []
     
     # Also store discovered layer names for each source
     discovered_layers: dict[str, list[str]] = {}
@@ -565,21 +798,28 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
     # Track expansion results for manifest
     expansion_results = {}
 
-    for template, (source, tiles) in sources.items():
-        console.print(f"Building PMTiles for [cyan]{source.name}[/]...")
-        
-        # Start with captured tiles
-        all_tiles = list(tiles)  # list of (coord, content)
-        
-        # Coverage expansion if requested
-        if expand_coverage:
-            try:
-                from .tiles.fetcher import analyze_coverage, expand_coverage as do_expand, AIOHTTP_AVAILABLE
-                
-                if not AIOHTTP_AVAILABLE:
-                    console.print("  [yellow]⚠ Coverage expansion requires aiohttp: pip install aiohttp[/]")
-                else:
-                    # Analyze current coverage
+    # (source, captured + expanded tiles) per source, built after expansion
+    to_build: list[tuple[TileSource, list[tuple[TileCoord, bytes]]]] = []
+    # Matching coverage from Step 4, or None where expansion added tiles
+    build_coverages: list[tuple[GeoBounds, tuple[int, int]] | None] = []
+
+    # Coverage expansion: analyze every source first, then fetch what's
+    # missing for all of them together over one shared session
+    fetched: dict[str, list[tuple[TileCoord, bytes]]] = {}
+    if expand_coverage:
+        try:
+            from .tiles.fetcher import (
+                AIOHTTP_AVAILABLE, ExpansionSpec, analyze_coverage, expand_coverage_many,
+            )
+            
+            if not AIOHTTP_AVAILABLE:
+                console.print("[yellow]⚠ Coverage expansion requires aiohttp: pip install aiohttp[/]")
+            else:
+                specs: list[ExpansionSpec] = []
+                spec_templates: list[str] = []
+                spec_missing: list[int] = []
+                for template, (source, tiles) in sources.items():
+                    console.print(f"Checking coverage for [cyan]{source.name}[/]...")
                     report = analyze_coverage(tiles, bounds, expand_zoom)
                     
                     if report.total_missing > 0:
@@ -594,39 +834,51 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
                                 if missing > 0:
                                     console.print(f"    z{z}: {captured}/{required} tiles ({missing} missing)")
                         
-                        # Fetch missing tiles with progress
-                        from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
-                        
-                        with Progress(
-                            SpinnerColumn(),
-                            TextColumn("[progress.description]{task.description}"),
-                            BarColumn(),
-                            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                            TextColumn("({task.completed}/{task.total})"),
-                            TimeElapsedColumn(),
-                            console=console,
-                        ) as progress:
-                            task = progress.add_task(
-                                f"Fetching tiles for {source.name}...", 
-                                total=report.total_missing
-                            )
-                            
-                            def update_progress(src_name, completed, total):
-                                progress.update(task, completed=completed)
-                            
-                            result = do_expand(
-                                url_template=source.url_template,
-                                source_name=source.name,
-                                captured_tiles=tiles,
-                                bounds=bounds,
-                                expand_zoom=expand_zoom,
-                                rate_limit=rate_limit,
-                                progress_callback=update_progress
+                        specs.append(ExpansionSpec(
+                            url_template=source.url_template,
+                            source_name=source.name,
+                            captured_tiles=tiles,
+                            bounds=bounds,
+                            expand_zoom=expand_zoom,
+                        ))
+                        spec_templates.append(template)
+                        spec_missing.append(report.total_missing)
+                    else:
+                        console.print(f"  ✓ Full coverage: {report.total_captured} tiles")
+                
+                if specs:
+                    # Fetch missing tiles with one progress bar per source
+                    from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
+                    
+                    with Progress(
+                        SpinnerColumn(),
+                        TextColumn("[progress.description]{task.description}"),
+                        BarColumn(),
+                        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                        TextColumn("({task.completed}/{task.total})"),
+                        TimeElapsedColumn(),
+                        console=console,
+                    ) as progress:
+                        tasks = {
+                            spec.source_name: progress.add_task(
+                                f"Fetching tiles for {spec.source_name}...", total=missing
                             )
+                            for spec, missing in zip(specs, spec_missing)
+                        }
+                        
+                        def update_progress(src_name, completed, total):
+                            progress.update(tasks[src_name], completed=completed)
+                        
+                        results = expand_coverage_many(
+                            specs, rate_limit=rate_limit, progress_callback=update_progress
+                        )
+                    
+                    for template, result in zip(spec_templates, results):
+                        console.print(f"[cyan]{result.source_name}[/]:")
                         
                         # Add fetched tiles
                         if result.new_tiles:
-                            all_tiles.extend(result.new_tiles)
+                            fetched[template] = result.new_tiles
                             console.print(f"  ✓ Fetched {result.fetched_count} additional tiles")
                         
                         if result.failed_count > 0:
@@ -636,73 +888,40 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
                             console.print(f"  [yellow]⚠ {result.auth_failures} tiles require authentication[/]")
                         
                         # Store for manifest
-                        expansion_results[source.name] = {
+                        expansion_results[result.source_name] = {
                             "original_tiles": result.original_count,
                             "fetched_tiles": result.fetched_count,
                             "failed_tiles": result.failed_count,
                             "auth_failures": result.auth_failures,
                             "success_rate": result.success_rate
                         }
-                    else:
-                        console.print(f"  ✓ Full coverage: {report.total_captured} tiles")
-                        
-            except ImportError as e:
-                console.print(f"  [yellow]⚠ Coverage expansion unavailable: {e}[/]")
+                
+        except ImportError as e:
+            console.print(f"[yellow]⚠ Coverage expansion unavailable: {e}[/]")
         
-        # Build PMTiles with all tiles (captured + expanded)
-        pmtiles_path = temp_dir / f"{source.name}.pmtiles"
-        builder = PMTilesBuilder(pmtiles_path)
-
-        for coord, content in all_tiles:
-            builder.add_tile(coord, content)
-
-        source_coords = [t[0] for t in all_tiles]
-        source_bounds = coverage_calc.calculate_bounds(source_coords)
-        source_zoom = coverage_calc.get_zoom_range(source_coords)
-
-        # Discover layer names from tile content BEFORE building (for vector tiles)
-        vector_layers_metadata = None
-        if source.tile_type == "vector":
-            layer_names = discover_layers_from_tiles(all_tiles)
-            discovered_layers[source.name] = layer_names
-            if layer_names:
-                console.print(f"  ✓ Discovered layers: [cyan]{', '.join(layer_names)}[/]")
-                # Format as TileJSON vector_layers spec
-                vector_layers_metadata = [
-                    {
-                        "id": layer_name,
-                        "fields": {},  # Could be enhanced to discover fields
-                        "minzoom": source_zoom[0],
-                        "maxzoom": source_zoom[1],
-                    }
-                    for layer_name in layer_names
-                ]
-            else:
-                console.print(f"  [yellow]⚠ Could not discover layer names from tile content[/]")
-
-        builder.set_metadata(PMTilesMetadata(
-            name=source.name,
-            description=f"Tiles from {source.url_template}",
-            bounds=source_bounds,
-            min_zoom=source_zoom[0],
-            max_zoom=source_zoom[1],
-            tile_type=source.tile_type,
-            format=source.format,
-            vector_layers=vector_layers_metadata,
-        ))
-
-        builder.build()
-
-        info = TileSourceInfo(
-            name=source.name,
-            path=f"tiles/{source.name}.pmtiles",
-            tile_type=source.tile_type,
-            format=source.format,
-            tile_count=len(all_tiles),
-            zoom_range=source_zoom,
-        )
-        pmtiles_files.append((source.name, pmtiles_path, info))
-        console.print(f"  ✓ Created {pmtiles_path.name} ({len(all_tiles)} tiles)")
+        console.print()
+
+    for template, (source, tiles) in sources.items():
+        console.print(f"Building PMTiles for [cyan]{source.name}[/]...")
+        
+        # Captured tiles, plus any fetched by coverage expansion
+        new_tiles = fetched.get(template)
+        to_build.append((source, tiles + new_tiles if new_tiles else tiles))
+        build_coverages.append(None if new_tiles else source_coverage[template])
+    fetched.clear()
+
+    built = _build_sources(
+        to_build, temp_dir, jobs, verbose, build_coverages, compression, executor
+    )
+    # Tiles fetched by coverage expansion are only referenced from here;
+    # release them now rather than holding them through packaging
+    to_build.clear()
+
+    for source_name, pmtiles, info, layer_names in built:
+        if layer_names is not None:
+            discovered_layers[source_name] = layer_names
+        pmtiles_files.append((source_name, pmtiles, info))
+        _print_built_source(source_name, info, layer_names)
 
     console.print()
 
@@ -710,7 +929,7 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
     extracted_assets = []
     site_dir = None
     
-    if archive_mode in (ArchiveMode.ORIGINAL, ArchiveMode.FULL):
+    if archive_mode in _ORIGINAL_MODES:
         console.print("Extracting original site assets...")
         
         # Detect base URL from HAR
@@ -730,14 +949,8 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
         if extracted_assets:
             console.print(f"  ✓ Extracted [cyan]{len(extracted_assets)}[/] site assets")
             
-            # Count by type
-            html_count = sum(1 for a in extracted_assets if a.mime_type == 'text/html')
-            css_count = sum(1 for a in extracted_assets if a.mime_type == 'text/css')
-            js_count = sum(1 for a in extracted_assets if 'javascript' in a.mime_type)
-            other_count = len(extracted_assets) - html_count - css_count - js_count
-            
             if verbose:
-                console.print(f"    HTML: {html_count}, CSS: {css_count}, JS: {js_count}, Other: {other_count}")
+                console.print(f"    {_asset_type_summary(extracted_assets)}")
         else:
             console.print("  [yellow]⚠ No site assets found to extract[/]")
         
@@ -748,13 +961,12 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
     
     sprite_bundle, glyph_bundle = extract_all_resources(entries)
     
-    resources_dir = temp_dir / "resources"
-    resources_dir.mkdir(exist_ok=True)
+    # Kept in memory as (archive_path, bytes) until packaging
+    resource_files: list[tuple[str, bytes]] = []
     
     sprite_path = None
     if sprite_bundle.has_sprites:
-        sprites_dir = resources_dir / "sprites"
-        sprite_bundle.write_to_directory(sprites_dir)
+        resource_files.extend(sprite_bundle.iter_entries("resources/sprites"))
         sprite_path = "resources/sprites/sprite"
         console.print(f"  ✓ Extracted sprites")
         if verbose:
@@ -765,8 +977,8 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
     
     glyphs_path = None
     if glyph_bundle.has_glyphs:
-        glyphs_dir = resources_dir / "glyphs"
-        written = glyph_bundle.write_to_directory(glyphs_dir)
+        resource_files.extend(glyph_bundle.iter_entries("resources/glyphs"))
+        written = glyph_bundle.range_counts()
         glyphs_path = "resources/glyphs/{fontstack}/{range}.pbf"
         console.print(f"  ✓ Extracted glyphs for [cyan]{len(written)}[/] font stacks")
         if verbose:
@@ -792,8 +1004,7 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
     if style_override:
         console.print(f"  Loading style override from [cyan]{style_override}[/]")
         try:
-            with open(style_override, 'r') as f:
-                override_style = json.load(f)
+            override_style = _load_json(style_override)
             
             # Extract layers grouped by source
             if 'layers' in override_style:
@@ -809,66 +1020,82 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
         except Exception as e:
             console.print(f"  [red]✗ Failed to load style override: {e}[/]")
             override_style = None
-
-    style_report = extract_styles_from_har(entries, detected_urls)
-
-    if style_report.extracted_layers:
-        console.print(f"  ✓ Extracted styling for [cyan]{len(style_report.extracted_layers)}[/] layers")
-        for layer in style_report.extracted_layers:
-            if verbose:
-                console.print(f"    • {layer.source_layer or 'unknown'}: {len(layer.colors)} colors, confidence: {layer.extraction_confidence:.0%}")
+            override_layers_by_source = {}
+
+    # Lowercase override source ids once, not once per tile source
+    override_ids = [(source_id, source_id.lower()) for source_id in override_layers_by_source]
+
+    # JS-extracted styling is only used for sources the override doesn't
+    # match; when it matches all of them, skip scanning the scripts
+    if override_style and all(
+        _match_override_source(info.name, override_ids) is not None
+        for _, _, info in pmtiles_files
+    ):
+        console.print("  ✓ Style override covers every tile source, skipping JavaScript extraction")
+        style_report = StyleExtractionReport(
+            extracted_layers=[],
+            unmatched_sources=[],
+            js_files_analyzed=0,
+            notes=["JavaScript extraction skipped: style override covers every tile source"],
+        )
     else:
-        console.print("  [yellow]⚠ No data layer styling could be extracted from JavaScript[/]")
+        style_report = extract_styles_from_har(script_entries, detected_urls, jobs, executor)
 
-    if style_report.unmatched_sources:
-        console.print(f"  [yellow]⚠ {len(style_report.unmatched_sources)} sources have no extracted styling[/]")
+        if style_report.extracted_layers:
+            console.print(f"  ✓ Extracted styling for [cyan]{len(style_report.extracted_layers)}[/] layers")
+            for layer in style_report.extracted_layers:
+                if verbose:
+                    console.print(f"    • {layer.source_layer or 'unknown'}: {len(layer.colors)} colors, confidence: {layer.extraction_confidence:.0%}")
+        else:
+            console.print("  [yellow]⚠ No data layer styling could be extracted from JavaScript[/]")
+
+        if style_report.unmatched_sources:
+            console.print(f"  [yellow]⚠ {len(style_report.unmatched_sources)} sources have no extracted styling[/]")
 
     console.print()
 
     # Step 7: Generate viewer
     # Detect which sources are "orphan" (not in style.json)
     # This is the common case - data layers added programmatically
-    BASEMAP_DOMAINS = ['maptiler', 'mapbox', 'esri', 'osm']
-
     console.print("Generating viewer...")
     viewer_gen = ViewerGenerator()
 
+    # Lowercase extracted layer tile URLs once, not once per tile source
+    layer_urls = [
+        (layer, layer.tile_url.lower())
+        for layer in style_report.extracted_layers
+        if layer.tile_url
+    ]
+
     tile_source_configs = []
     for _, _, info in pmtiles_files:
         # Detect if this is likely a basemap vs data layer
-        is_basemap = any(domain in info.name.lower() for domain in BASEMAP_DOMAINS)
+        is_basemap = _BASEMAP_RE.search(info.name) is not None
         
         # Get discovered layer names for this source (from actual tile inspection)
         source_layers = discovered_layers.get(info.name, [])
 
         # Find extracted styling for this source if available (for colors, etc.)
         extracted_style = None
-        for layer in style_report.extracted_layers:
-            if layer.tile_url:
-                # Match by checking if key identifying parts of the source name appear in the URL
-                # This is more robust than substring matching after normalization
-                source_parts = info.name.lower().replace('-', ' ').replace('_', ' ').replace('.', ' ').split()
-                url_lower = layer.tile_url.lower()
-                
-                # Filter out common non-identifying parts
-                skip_parts = {'pbf', 'mvt', 'tiles', 'api', 'v1', 'v2', 'v3', 'v4'}
-                identifying_parts = [p for p in source_parts if p not in skip_parts and len(p) > 2]
-                
-                # Check if most identifying parts appear in URL
-                matches = sum(1 for part in identifying_parts if part in url_lower)
-                match_ratio = matches / len(identifying_parts) if identifying_parts else 0
-                
+        # Match by checking if key identifying parts of the source name appear in the URL
+        # This is more robust than substring matching after normalization
+        identifying_parts = _identifying_parts(info.name)
+        for layer, url_lower in layer_urls:
+            # Check if most identifying parts appear in URL
+            matches = sum(1 for part in identifying_parts if part in url_lower)
+            match_ratio = matches / len(identifying_parts) if identifying_parts else 0
+
+            if verbose:
+                console.print(f"  Matching '{info.name}' against layer URL '{layer.tile_url}'")
+                console.print(f"    Identifying parts: {identifying_parts}")
+                console.print(f"    Matches: {matches}/{len(identifying_parts)} ({match_ratio:.0%})")
+
+            # Consider it a match if at least 50% of identifying parts are found
+            if match_ratio >= 0.5:
+                extracted_style = layer
                 if verbose:
-                    console.print(f"  Matching '{info.name}' against layer URL '{layer.tile_url}'")
-                    console.print(f"    Identifying parts: {identifying_parts}")
-                    console.print(f"    Matches: {matches}/{len(identifying_parts)} ({match_ratio:.0%})")
-                
-                # Consider it a match if at least 50% of identifying parts are found
-                if match_ratio >= 0.5:
-                    extracted_style = layer
-                    if verbose:
-                        console.print(f"  ✓ Matched {info.name} to extracted layer")
-                    break
+                    console.print(f"  ✓ Matched {info.name} to extracted layer")
+                break
 
         # Build extracted style config
         # PRIORITY: 
@@ -880,16 +1107,12 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
         # Check if we have override layers for this source
         override_layers = None
         if override_style:
-            # Try to match by source name
-            for override_source_id in override_layers_by_source.keys():
-                # Check if source names match (with some flexibility)
-                if (override_source_id.lower() in info.name.lower() or 
-                    info.name.lower() in override_source_id.lower() or
-                    any(part in override_source_id.lower() for part in info.name.lower().split('-') if len(part) > 2)):
-                    override_layers = override_layers_by_source[override_source_id]
-                    if verbose:
-                        console.print(f"  ✓ Found {len(override_layers)} override layers for {info.name} (matched {override_source_id})")
-                    break
+            # Try to match by source name (with some flexibility)
+            override_source_id = _match_override_source(info.name, override_ids)
+            if override_source_id is not None:
+                override_layers = override_layers_by_source[override_source_id]
+                if verbose:
+                    console.print(f"  ✓ Found {len(override_layers)} override layers for {info.name} (matched {override_source_id})")
         
         if override_layers:
             # Use the complete layer definitions from override
@@ -945,11 +1168,14 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
     console.print("Packaging archive...")
     packager = ArchivePackager(output)
 
-    for name_, pmtiles_path, info in pmtiles_files:
-        packager.add_pmtiles(name_, pmtiles_path)
+    for name_, pmtiles, info in pmtiles_files:
+        packager.add_pmtiles(
+            name_, pmtiles, delete_after=True,
+            tiles_compressed=compression == "gzip" or info.tile_type != "vector",
+        )
 
     # Write extracted styles to a separate file for manual refinement
-    extracted_styles_json = json.dumps({
+    extracted_styles_json = dumps_indented({
         "extraction_report": style_report.to_manifest_section(),
         "layers": [
             {
@@ -965,21 +1191,18 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
             for layer in style_report.extracted_layers
         ],
         "_comment": "This file documents extracted styling. Edit to refine layer appearance."
-    }, indent=2)
-    packager.temp_files.append(("style/extracted_layers.json", extracted_styles_json.encode('utf-8')))
+    })
+    packager.temp_files.append(("style/extracted_layers.json", extracted_styles_json))
 
     # Add viewer HTML (for standalone and full modes)
-    if archive_mode in (ArchiveMode.STANDALONE, ArchiveMode.FULL):
+    if archive_mode in _VIEWER_MODES:
         packager.add_viewer(viewer_html)
         console.print("  ✓ Added standalone viewer")
 
     # Add original site files (for original and full modes)
-    if archive_mode in (ArchiveMode.ORIGINAL, ArchiveMode.FULL) and site_dir and site_dir.exists():
+    if archive_mode in _ORIGINAL_MODES and site_dir and site_dir.exists():
         # Add all files from the site directory
-        for file_path in site_dir.rglob('*'):
-            if file_path.is_file():
-                rel_path = file_path.relative_to(temp_dir)
-                packager.temp_files.append((str(rel_path), file_path))
+        packager.temp_files.extend(_walk_files(site_dir, temp_dir))
         
         console.print(f"  ✓ Added original site ({len(extracted_assets)} files)")
         
@@ -992,24 +1215,18 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
             console.print("  [yellow]⚠ serve.py template not found[/]")
 
     # Add resources (sprites, glyphs)
-    if resources_dir.exists():
-        for file_path in resources_dir.rglob('*'):
-            if file_path.is_file():
-                rel_path = file_path.relative_to(temp_dir)
-                packager.temp_files.append((str(rel_path), file_path))
-        
-        resource_count = sum(1 for _ in resources_dir.rglob('*') if _.is_file())
-        if resource_count > 0:
-            console.print(f"  ✓ Added map resources ({resource_count} files)")
+    if resource_files:
+        packager.temp_files.extend(resource_files)
+        console.print(f"  ✓ Added map resources ({len(resource_files)} files)")
 
     # Prepare manifest with additional metadata
     original_site_info = None
-    if archive_mode in (ArchiveMode.ORIGINAL, ArchiveMode.FULL) and extracted_assets:
+    if archive_mode in _ORIGINAL_MODES and extracted_assets:
         original_site_info = {
             "available": True,
             "entry_point": "original/index.html",
             "file_count": len(extracted_assets),
-            "total_size_bytes": sum(len(a.content) for a in extracted_assets)
+            "total_size_bytes": sum(a.size for a in extracted_assets)
         }
 
     resources_info = {}
@@ -1089,158 +1306,28 @@ def create(har_file: Path, output: Path | None, name: str | None, verbose: bool,
         console.print("  Option B (original site): Extract ZIP and run: python serve.py")
 
 
-@main.command()
-@click.argument('capture_file', type=click.Path(exists=True, path_type=Path))
-@click.option('-o', '--output', type=click.Path(path_type=Path), help='Output ZIP path')
-@click.option('-n', '--name', help='Archive name (default: derived from metadata)')
-@click.option('-v', '--verbose', is_flag=True, help='Verbose output')
-@click.option('--mode', type=click.Choice(['standalone', 'original', 'full']), default='standalone',
-              help='Archive mode (default: standalone)')
-def process(capture_file: Path, output: Path | None, name: str | None, verbose: bool, mode: str):
-    """Create an archive from a capture bundle.
-
-    Capture bundles are richer than HAR files and can contain:
-    - Pre-extracted tiles and resources
-    - Runtime map style from map.getStyle()
-    - Viewport state and metadata
-
-    Supports multiple formats:
-    - JSON: .webmap.json, .webmap-capture.json
-    - Gzipped JSON: .webmap.json.gz
-    - Directory bundle: folder with manifest.json
-    - NDJSON stream: .webmap.ndjson
-    """
-    archive_mode = ArchiveMode(mode)
-
-    console.print(f"[bold]Processing capture bundle:[/] {capture_file}")
-    console.print(f"[bold]Mode:[/] {archive_mode.value}")
-    console.print()
-
-    # Step 1: Parse capture bundle
-    with console.status("Parsing capture bundle..."):
-        try:
-            parser = CaptureParser()
-            bundle = parser.parse(capture_file)
-        except Exception as e:
-            console.print(f"[red]✗ Failed to parse capture bundle: {e}[/]")
-            raise click.Abort()
-
-    console.print(f"  ✓ Parsed capture bundle (version {bundle.version})")
-    console.print(f"  Source: [cyan]{bundle.metadata.url}[/]")
-    console.print(f"  Title: {bundle.metadata.title or '(untitled)'}")
-    console.print(f"  Captured: {bundle.metadata.captured_at}")
-    if bundle.metadata.map_library_type:
-        console.print(f"  Map library: {bundle.metadata.map_library_type} {bundle.metadata.map_library_version or ''}")
-    console.print(f"  Viewport: {bundle.viewport.center} @ z{bundle.viewport.zoom}")
-    console.print(f"  Tiles: {len(bundle.tiles)}")
-    console.print(f"  Resources: {len(bundle.resources)}")
-    console.print(f"  Has style: {'✓' if bundle.style else '✗'}")
-    console.print(f"  Has HAR: {'✓' if bundle.har else '✗'}")
-    console.print()
-
-    # Step 2: Validate bundle
-    with console.status("Validating bundle..."):
-        warnings = validate_capture_bundle(bundle)
-
-    if warnings:
-        console.print("[yellow]Warnings:[/]")
-        for warning in warnings:
-            console.print(f"  ⚠ {warning}")
-        console.print()
-
-    # Step 3: Process bundle into intermediate form
-    with console.status("Processing bundle..."):
-        processed = process_capture_bundle(bundle)
-
-    console.print(f"  ✓ Processed capture")
-    console.print(f"  Tile sources: [cyan]{len(processed.tile_sources)}[/]")
-    for source_id, source in processed.tile_sources.items():
-        tile_count = len(processed.tiles_by_source.get(source_id, []))
-        console.print(f"    • {source.name}: {tile_count} tiles ({source.tile_type})")
-    console.print()
-
-    # Set defaults
-    if output is None:
-        if capture_file.is_dir():
-            output = capture_file.with_suffix('.zip')
-        else:
-            # Remove .webmap.json, .webmap-capture.json, etc.
-            stem = capture_file.stem
-            for suffix in ['.webmap', '.webmap-capture']:
-                if stem.endswith(suffix):
-                    stem = stem[:-len(suffix)]
-                    break
-            output = capture_file.parent / f"{stem}.zip"
-
-    if name is None:
-        name = processed.title
-
-    console.print(f"[bold]Output:[/] {output}")
-    console.print()
-
-    # Calculate zoom range
-    all_coords = [coord for tiles in processed.tiles_by_source.values() for coord, _ in tiles]
-    coverage_calc = CoverageCalculator()
-    zoom_range = coverage_calc.get_zoom_range(all_coords) if all_coords else (0, 14)
-
-    # Prepare capture metadata for manifest
-    capture_metadata = {
-        "source_url": processed.source_url,
-        "captured_at": processed.captured_at,
-        "viewport": {
-            "center": bundle.viewport.center,
-            "zoom": bundle.viewport.zoom,
-            "bearing": bundle.viewport.bearing,
-            "pitch": bundle.viewport.pitch
-        }
-    }
-
-    # Step 4: Use shared archive builder
-    build_archive_from_tiles(
-        tile_sources=processed.tile_sources,
-        tiles_by_source=processed.tiles_by_source,
-        bounds=processed.bounds,
-        zoom_range=zoom_range,
-        output_path=output,
-        archive_name=name,
-        archive_mode=archive_mode,
-        override_style=bundle.style,
-        har_entries=processed.har_entries,
-        capture_metadata=capture_metadata,
-        verbose=verbose
-    )
-
-    # Show usage instructions
-    if archive_mode == ArchiveMode.STANDALONE:
-        console.print("[bold]To view:[/]")
-        console.print("  1. Extract the ZIP file")
-        console.print("  2. Open viewer.html in a browser")
-    elif archive_mode == ArchiveMode.ORIGINAL:
-        console.print("[bold]To view:[/]")
-        console.print("  1. Extract the ZIP file")
-        console.print("  2. Run: python serve.py")
-        console.print("  3. Open http://localhost:8080 in a browser")
-    else:  # FULL
-        console.print("[bold]To view:[/]")
-        console.print("  Option A (standalone): Extract ZIP and open viewer.html")
-        console.print("  Option B (original site): Extract ZIP and run: python serve.py")
-
-
 @main.command()
 @click.argument('har_file', type=click.Path(exists=True, path_type=Path))
 def inspect(har_file: Path):
-    """Analyze a HAR file without creating an archive."""
+    """Analyze a HAR file (.har, .har.gz or .har.zst) without creating an archive."""
 
     console.print(f"[bold]Analyzing:[/] {har_file}")
     console.print()
 
     # Parse
     parser = HARParser(har_file)
-    entries = parser.parse()
 
-    # Classify
+    # Classify entries as they are parsed and detect tiles in the same
+    # pass; non-tile entries are only counted, not kept
     classifier = RequestClassifier()
-    grouped = classifier.classify_all(entries)
+    detector = TileDetector()
+    counts: Counter[RequestType] = Counter()
+    detected = []
+
+    for entry in classifier.classify_tile_entries(parser.iter_entries_prefetched(), counts):
+        tile = detector.detect(entry.url, entry.content)
+        if tile:
+            detected.append(tile)
 
     # Summary table
     table = Table(title="Request Classification")
@@ -1248,22 +1335,13 @@ def inspect(har_file: Path):
     table.add_column("Count", justify="right")
 
     for req_type in RequestType:
-        count = len(grouped[req_type])
+        count = counts[req_type]
         if count > 0:
             table.add_row(req_type.name, str(count))
 
     console.print(table)
     console.print()
 
-    # Detect tiles
-    detector = TileDetector()
-    detected = []
-
-    for entry in grouped[RequestType.VECTOR_TILE] + grouped[RequestType.RASTER_TILE]:
-        tile = detector.detect(entry.url, entry.content)
-        if tile:
-            detected.append(tile)
-
     if detected:
         sources = detector.group_by_source(detected)
 
@@ -1277,8 +1355,7 @@ def inspect(har_file: Path):
         coverage_calc = CoverageCalculator()
 
         for template, (source, tiles) in sources.items():
-            coords = [t[0] for t in tiles]
-            zoom_range = coverage_calc.get_zoom_range(coords)
+            zoom_range = coverage_calc.get_zoom_range(t[0] for t in tiles)
             table.add_row(
                 source.name,
                 source.tile_type,
@@ -1290,8 +1367,9 @@ def inspect(har_file: Path):
         console.print()
 
         # Geographic coverage
-        all_coords = [t[0] for tiles in sources.values() for t in tiles[1]]
-        bounds = coverage_calc.calculate_bounds(all_coords)
+        bounds = coverage_calc.calculate_bounds(
+            t[0] for tiles in sources.values() for t in tiles[1]
+        )
 
         console.print("[bold]Geographic Coverage:[/]")
         console.print(f"  West:  {bounds.west:.4f}°")
@@ -1305,7 +1383,11 @@ def inspect(har_file: Path):
 @click.argument('bundle_file', type=click.Path(exists=True, path_type=Path))
 @click.option('-o', '--output', type=click.Path(path_type=Path), help='Output ZIP path')
 @click.option('-v', '--verbose', is_flag=True, help='Verbose output')
-def process(bundle_file: Path, output: Path | None, verbose: bool):
+@click.option('-j', '--jobs', type=click.IntRange(min=1), default=lambda: os.cpu_count() or 1,
+              help='Number of tile sources to build in parallel (default: CPU count)')
+@click.option('--compression', type=click.Choice(VECTOR_TILE_COMPRESSIONS), default='gzip',
+              help='Vector tile compression in PMTiles (default: gzip; raster tiles are stored as-is)')
+def process(bundle_file: Path, output: Path | None, verbose: bool, jobs: int, compression: str):
     """Process a capture bundle into an archive.
 
     This command processes capture bundles created by the browser extension
@@ -1314,6 +1396,7 @@ def process(bundle_file: Path, output: Path | None, verbose: bool):
     """
     from .api import create_archive_from_bundle, inspect_bundle
 
+    executor = _command_pool(jobs)
     bundle_path = Path(bundle_file)
 
     # Set defaults
@@ -1326,8 +1409,7 @@ def process(bundle_file: Path, output: Path | None, verbose: bool):
 
     # Load bundle
     with console.status("Loading bundle..."):
-        with open(bundle_path) as f:
-            bundle = json.load(f)
+        bundle = _load_json(bundle_path)
 
     # Inspect first
     with console.status("Validating bundle..."):
@@ -1357,6 +1439,9 @@ def process(bundle_file: Path, output: Path | None, verbose: bool):
             bundle=bundle,
             output_path=output,
             verbose=verbose,
+            jobs=jobs,
+            compression=compression,
+            executor=executor,
         )
 
         console.print("[green]✓ Archive created successfully![/]")
@@ -7,8 +7,10 @@ Key requirements:
 - Return classification with confidence score
 """
 
+from collections import Counter
 from enum import Enum, auto
 from dataclasses import dataclass
+from typing import Iterable, Iterator
 import re
 
 from .parser import HAREntry
@@ -88,7 +90,7 @@ class RequestClassifier:
 
         return Classification(RequestType.OTHER, 0.0)
 
-    def classify_all(self, entries: list[HAREntry]) -> dict[RequestType, list[HAREntry]]:
+    def classify_all(self, entries: Iterable[HAREntry]) -> dict[RequestType, list[HAREntry]]:
         """Classify all entries and group by type."""
         grouped: dict[RequestType, list[HAREntry]] = {t: [] for t in RequestType}
 
@@ -98,3 +100,25 @@ class RequestClassifier:
                 grouped[result.request_type].append(entry)
 
         return grouped
+
+    def classify_tile_entries(
+        self,
+        entries: Iterable[HAREntry],
+        counts: Counter | None = None,
+    ) -> Iterator[HAREntry]:
+        """
+        Yield only vector and raster tile entries, in input order.
+
+        Same filter and classification as classify_all(), but every other
+        entry is dropped as soon as it is classified instead of being kept
+        in a list. If counts is given, it is updated with the number of
+        entries of each RequestType (tiles and non-tiles alike).
+        """
+        tile_types = (RequestType.VECTOR_TILE, RequestType.RASTER_TILE)
+        for entry in entries:
+            if entry.is_successful and entry.has_content:
+                request_type = self.classify(entry).request_type
+                if counts is not None:
+                    counts[request_type] += 1
+                if request_type in tile_types:
+                    yield entry
@@ -11,8 +11,38 @@ Key requirements:
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO, Iterator
 import json
 import base64
+import os
+import gzip
+import mmap
+import queue
+import threading
+
+# Optional: ijson streams entries out of the HAR instead of loading the
+# whole document; it picks its C (yajl2_c) backend when one is built
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Optional: zstandard for reading .har.zst files
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+# Suffixes of compressed HAR files, decompressed while they are parsed
+COMPRESSED_HAR_SUFFIXES = frozenset({'.gz', '.zst'})
+
+# Entries iter_entries_prefetched() may parse ahead of its consumer
+_PREFETCH_ENTRIES = 1024
+
+# Marks the end of the prefetch queue
+_END = object()
 
 
 @dataclass
@@ -42,13 +72,108 @@ class HARParser:
 
     def parse(self) -> list[HAREntry]:
         """Parse HAR file and return all entries."""
+        return list(self.iter_entries())
+
+    def iter_entries(self) -> Iterator[HAREntry]:
+        """
+        Parse HAR file and yield its entries one at a time.
+
+        With ijson installed only the entry being parsed is held as JSON,
+        rather than the whole document; without it the file is loaded
+        with json.load first.
+        """
         if not self.har_path:
             raise ValueError("No HAR path provided")
 
-        with open(self.har_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        return self.parse_har_data(data)
+        with self._open() as f:
+            if IJSON_AVAILABLE:
+                raw_entries = ijson.items(f, 'log.entries.item')
+            else:
+                raw_entries = json.load(f)['log']['entries']
+
+            for entry in raw_entries:
+                parsed = self._parse_entry(entry)
+                if parsed:
+                    yield parsed
+
+    def iter_entries_prefetched(self, maxsize: int = _PREFETCH_ENTRIES) -> Iterator[HAREntry]:
+        """
+        Like iter_entries(), but parse on a background thread.
+
+        Up to maxsize entries are parsed ahead, so file reads and
+        decompression (which release the GIL) overlap with whatever the
+        caller does per entry. Parser errors are re-raised here; if the
+        caller stops early, the thread stops at its next entry.
+        """
+        entries: queue.Queue = queue.Queue(maxsize)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    entries.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce() -> None:
+            try:
+                for entry in self.iter_entries():
+                    if not put(entry):
+                        return
+            except BaseException as e:
+                put(e)
+            else:
+                put(_END)
+
+        thread = threading.Thread(target=produce, name="har-parser", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = entries.get()
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+    def _open(self) -> BinaryIO:
+        """
+        Open the HAR file for binary reading.
+
+        .gz and .zst files are decompressed as a stream, so the parser
+        reads from the decompressor directly with no decompressed copy
+        on disk or in memory. Plain files are memory-mapped, so reads are
+        served from the page cache without a separate buffered copy.
+        """
+        suffix = self.har_path.suffix.lower()
+        if suffix == '.gz':
+            return gzip.open(self.har_path, 'rb')
+        if suffix == '.zst':
+            if not ZSTANDARD_AVAILABLE:
+                raise ValueError(
+                    "Reading .zst HAR files requires zstandard: pip install zstandard"
+                )
+            return zstandard.ZstdDecompressor().stream_reader(open(self.har_path, 'rb'))
+
+        f = open(self.har_path, 'rb')
+        try:
+            if os.fstat(f.fileno()).st_size == 0:
+                # Empty files can't be mapped; let the parser report them
+                return f
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Not mappable (e.g. a pipe); read it as a regular file
+            return f
+        f.close()
+        # Entries are parsed front to back: read ahead aggressively
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        return mapped
 
     def parse_har_data(self, data: dict) -> list[HAREntry]:
         """Parse HAR data from a dictionary."""
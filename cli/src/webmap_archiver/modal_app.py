@@ -55,6 +55,7 @@ image = (
         "git+https://github.com/research-project-studio/snowglobe.git@443a722#subdirectory=cli",
         "fastapi>=0.109.0",
         "nest_asyncio",
+        "ijson>=3.1",
     )
 )
 
@@ -72,7 +73,7 @@ VOLUME_PATH = "/outputs"
 @modal.asgi_app()
 def fastapi_app():
     """FastAPI app for the WebMap Archiver API."""
-    from fastapi import FastAPI, HTTPException
+    from fastapi import FastAPI, HTTPException, Request
     from fastapi.responses import FileResponse
     from pydantic import BaseModel
     from typing import Optional
@@ -98,6 +99,52 @@ def fastapi_app():
         version=__version__,
     )
 
+    # Optional: ijson parses the spooled body incrementally
+    try:
+        import ijson
+        IJSON_AVAILABLE = True
+    except ImportError:
+        IJSON_AVAILABLE = False
+
+    # Bodies larger than this spill from memory to disk while being received
+    BODY_SPOOL_MAX_SIZE = 1024 * 1024
+
+    def load_json(f) -> dict:
+        """
+        Parse a JSON document from a binary file object.
+
+        With ijson the document is built from small reads of the file, so
+        the raw body is never in memory whole next to the parsed dict;
+        without it json.load reads the whole file first.
+        """
+        import json
+
+        if IJSON_AVAILABLE:
+            try:
+                return next(ijson.items(f, "", use_float=True))
+            except (ijson.JSONError, StopIteration) as e:
+                raise ValueError(str(e) or "empty document") from e
+        return json.load(f)
+
+    async def read_json_body(request: Request) -> dict:
+        """
+        Read a JSON request body without buffering it whole in memory.
+
+        The body is streamed chunk-by-chunk into a SpooledTemporaryFile
+        (disk-backed above BODY_SPOOL_MAX_SIZE) and parsed from there by
+        load_json().
+        """
+        import tempfile
+
+        with tempfile.SpooledTemporaryFile(max_size=BODY_SPOOL_MAX_SIZE) as spool:
+            async for chunk in request.stream():
+                spool.write(chunk)
+            spool.seek(0)
+            try:
+                return await asyncio.to_thread(load_json, spool)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+
     class FetchStyleRequest(BaseModel):
         """Request to fetch style from URL."""
 
@@ -181,18 +228,22 @@ def fastapi_app():
         }
 
     @web_app.post("/process")
-    async def process(bundle: dict):
+    async def process(request: Request):
         """
         Process a capture bundle into an archive.
 
         If the bundle has no style but includes a URL in metadata,
         will attempt to fetch the style via Puppeteer.
 
-        Args:
-            bundle: Capture bundle dict with tiles, metadata, etc.
-                    If bundle.metadata.url exists and bundle.style is null,
-                    style will be fetched from that URL.
+        The request body is the capture bundle JSON (tiles, metadata, etc.).
+        If bundle.metadata.url exists and bundle.style is null, style will
+        be fetched from that URL. The body is streamed to a spooled temp
+        file rather than buffered whole before parsing.
         """
+        bundle = await read_json_body(request)
+        if not isinstance(bundle, dict):
+            raise HTTPException(status_code=400, detail="Bundle must be a JSON object")
+
         try:
             archive_id = str(uuid.uuid4())[:8]
             output_path = Path(VOLUME_PATH) / f"{archive_id}.zip"
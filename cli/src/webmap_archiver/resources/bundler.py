@@ -12,6 +12,7 @@ import json
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterator
 from urllib.parse import urlparse
 
 from ..har.parser import HAREntry
@@ -30,6 +31,29 @@ class SpriteBundle:
         """Check if any sprite resources were found."""
         return any([self.png_1x, self.png_2x, self.json_1x, self.json_2x])
     
+    def _files(self, name: str) -> list[tuple[str, str, bytes]]:
+        """(key, filename, content) for each sprite file present."""
+        files = []
+        if self.png_1x:
+            files.append(('png_1x', f"{name}.png", self.png_1x))
+        if self.png_2x:
+            files.append(('png_2x', f"{name}@2x.png", self.png_2x))
+        if self.json_1x:
+            files.append(('json_1x', f"{name}.json", json.dumps(self.json_1x, indent=2).encode('utf-8')))
+        if self.json_2x:
+            files.append(('json_2x', f"{name}@2x.json", json.dumps(self.json_2x, indent=2).encode('utf-8')))
+        return files
+
+    def iter_entries(self, prefix: str, name: str = "sprite") -> Iterator[tuple[str, bytes]]:
+        """
+        Yield (archive_path, content) for each sprite file under prefix.
+
+        Lets the packager take the files straight from memory instead of
+        writing them to a directory and reading them back.
+        """
+        for _, filename, content in self._files(name):
+            yield f"{prefix}/{filename}", content
+
     def write_to_directory(self, output_dir: Path, name: str = "sprite") -> dict:
         """
         Write sprite files to directory.
@@ -39,25 +63,10 @@ class SpriteBundle:
         output_dir.mkdir(parents=True, exist_ok=True)
         written = {}
         
-        if self.png_1x:
-            path = output_dir / f"{name}.png"
-            path.write_bytes(self.png_1x)
-            written['png_1x'] = str(path)
-        
-        if self.png_2x:
-            path = output_dir / f"{name}@2x.png"
-            path.write_bytes(self.png_2x)
-            written['png_2x'] = str(path)
-        
-        if self.json_1x:
-            path = output_dir / f"{name}.json"
-            path.write_text(json.dumps(self.json_1x, indent=2))
-            written['json_1x'] = str(path)
-        
-        if self.json_2x:
-            path = output_dir / f"{name}@2x.json"
-            path.write_text(json.dumps(self.json_2x, indent=2))
-            written['json_2x'] = str(path)
+        for key, filename, content in self._files(name):
+            path = output_dir / filename
+            path.write_bytes(content)
+            written[key] = str(path)
         
         return written
 
@@ -91,6 +100,32 @@ class GlyphBundle:
         """Check if any glyph resources were found."""
         return len(self.ranges) > 0
     
+    @staticmethod
+    def _safe_name(font_stack: str) -> str:
+        """Sanitize a font stack name for use as a path segment."""
+        return re.sub(r'[<>:"|?*\\]', '_', font_stack)
+
+    def range_counts(self) -> dict:
+        """Count glyph ranges per (sanitized) font stack."""
+        counts = {}
+        for glyph in self.ranges:
+            safe_name = self._safe_name(glyph.font_stack)
+            counts[safe_name] = counts.get(safe_name, 0) + 1
+        return counts
+
+    def iter_entries(self, prefix: str) -> Iterator[tuple[str, bytes]]:
+        """
+        Yield (archive_path, content) for each glyph file under prefix.
+
+        Paths follow write_to_directory()'s layout; when two ranges map to
+        the same path the later one wins, as it would on disk.
+        """
+        files = {
+            f"{prefix}/{self._safe_name(glyph.font_stack)}/{glyph.filename}": glyph.content
+            for glyph in self.ranges
+        }
+        yield from files.items()
+
     def write_to_directory(self, output_dir: Path) -> dict:
         """
         Write glyph files to directory structure.
@@ -100,22 +135,13 @@ class GlyphBundle:
         Returns dict with font stacks and counts.
         """
         output_dir.mkdir(parents=True, exist_ok=True)
-        written = {}
         
         for glyph in self.ranges:
-            # Sanitize font stack name for filesystem
-            safe_name = re.sub(r'[<>:"|?*\\]', '_', glyph.font_stack)
-            font_dir = output_dir / safe_name
+            font_dir = output_dir / self._safe_name(glyph.font_stack)
             font_dir.mkdir(parents=True, exist_ok=True)
-            
-            path = font_dir / glyph.filename
-            path.write_bytes(glyph.content)
-            
-            if safe_name not in written:
-                written[safe_name] = 0
-            written[safe_name] += 1
+            (font_dir / glyph.filename).write_bytes(glyph.content)
         
-        return written
+        return self.range_counts()
 
 
 class SpriteBundler:
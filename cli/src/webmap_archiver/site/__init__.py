@@ -1,5 +1,5 @@
 """Site extraction utilities."""
 
-from .extractor import SiteExtractor, ExtractedAsset
+from .extractor import SiteExtractor, ExtractedAsset, ExtractedAssetInfo
 
-__all__ = ['SiteExtractor', 'ExtractedAsset']
+__all__ = ['SiteExtractor', 'ExtractedAsset', 'ExtractedAssetInfo']
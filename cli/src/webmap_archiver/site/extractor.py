@@ -34,6 +34,15 @@ class ExtractedAsset:
     original_url: str
 
 
+@dataclass
+class ExtractedAssetInfo:
+    """An asset already written to disk: its metadata, without the content."""
+    relative_path: str
+    mime_type: str
+    original_url: str
+    size: int
+
+
 class SiteExtractor:
     """Extract original site assets from HAR entries."""
     
@@ -244,11 +253,12 @@ class SiteExtractor:
         self, 
         entries: list[HAREntry], 
         output_dir: Path
-    ) -> list[ExtractedAsset]:
+    ) -> list[ExtractedAssetInfo]:
         """
         Extract assets and write to directory.
         
-        Returns list of extracted assets.
+        Returns metadata for each asset written; the content is on disk,
+        so the returned list doesn't keep every asset's bytes alive.
         """
         assets = []
         
@@ -260,7 +270,12 @@ class SiteExtractor:
             # Write content
             file_path.write_bytes(asset.content)
             
-            assets.append(asset)
+            assets.append(ExtractedAssetInfo(
+                relative_path=asset.relative_path,
+                mime_type=asset.mime_type,
+                original_url=asset.original_url,
+                size=len(asset.content),
+            ))
         
         return assets
     
@@ -18,11 +18,22 @@ LIMITATIONS:
 - Results should be validated against actual tile data
 """
 
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from typing import Any
+import multiprocessing
+import os
 import re
 import json
 
+# Total script bytes below which scanning stays in-process; starting
+# worker interpreters costs more than regex-scanning a few MB
+_PARALLEL_SCAN_MIN_BYTES = 16 * 1024 * 1024
+
+# Literal part of StyleExtractor.PATTERNS['tile_url']
+_TILE_URL_MARKER = '/{z}/{x}/{y}'
+
 
 @dataclass
 class ExtractedLayerStyle:
@@ -95,6 +106,11 @@ class StyleExtractor:
             r'\{[a-z_]+:"#[0-9a-fA-F]{6}"(?:,[a-z_]+:"#[0-9a-fA-F]{6}")*\}'
         ),
 
+        # Color object assigned in minified code: w={category:"#hexcolor",...}
+        'color_object_assignment': re.compile(
+            r'=\{([a-z_]+:"#[0-9a-fA-F]{6}"(?:,[a-z_]+:"#[0-9a-fA-F]{6}")+)\}'
+        ),
+
         # Individual color assignments: category:"#hexcolor"
         'color_pair': re.compile(
             r'([a-z_]+):"(#[0-9a-fA-F]{6})"'
@@ -146,6 +162,11 @@ class StyleExtractor:
         """
         extracted = []
 
+        # Every tile URL match contains this literal; a substring test
+        # rules out most scripts without running the backtracking regex
+        if _TILE_URL_MARKER not in js_content:
+            return extracted
+
         # Find all tile URLs in the JS
         tile_urls = self.PATTERNS['tile_url'].findall(js_content)
 
@@ -208,10 +229,7 @@ class StyleExtractor:
         if not style.colors:
             # Look for an object assignment pattern like w={category:"#hexcolor",...}
             # This is common in minified code
-            obj_assignment = re.search(
-                r'=\{([a-z_]+:"#[0-9a-fA-F]{6}"(?:,[a-z_]+:"#[0-9a-fA-F]{6}")+)\}',
-                content
-            )
+            obj_assignment = self.PATTERNS['color_object_assignment'].search(content)
             if obj_assignment:
                 obj_content = obj_assignment.group(1)
                 pairs = self.PATTERNS['color_pair'].findall(obj_content)
@@ -324,38 +342,72 @@ class StyleExtractor:
                 style.extraction_notes.append("Corrected layer type to 'circle' based on paint properties")
 
 
+def is_script_entry(entry) -> bool:
+    """Check whether a HAR entry is a JavaScript file (by MIME type or URL)."""
+    return 'javascript' in entry.mime_type.lower() or entry.url.lower().endswith('.js')
+
+
+def _scan_js_body(content: bytes, url: str) -> list[ExtractedLayerStyle]:
+    """
+    Extract styles from one script body; empty if it isn't UTF-8.
+
+    Module-level so extract_styles_from_har() can run it in worker
+    processes.
+    """
+    try:
+        js_text = content.decode('utf-8')
+    except UnicodeDecodeError:
+        return []
+    return StyleExtractor().extract_from_js(js_text, url)
+
+
 def extract_styles_from_har(
     entries: list,
-    detected_tile_sources: list[str]
+    detected_tile_sources: list[str],
+    jobs: int | None = None,
+    executor: Executor | None = None,
 ) -> StyleExtractionReport:
     """
     Extract styling from all JavaScript files in HAR.
 
+    Each script is scanned independently, so when there is enough script
+    content the scans are spread over up to `jobs` worker processes
+    (default: CPU count). Results keep the order of the entries.
+
     Args:
         entries: Parsed HAR entries
         detected_tile_sources: List of tile source URLs found in HAR
+        jobs: Maximum number of worker processes
+        executor: Pool to run parallel scans on (default: one started
+            for this call)
 
     Returns:
         StyleExtractionReport with extraction results
     """
-    extractor = StyleExtractor()
-    all_extracted = []
-    js_count = 0
-
-    for entry in entries:
-        # Check if this is a JavaScript file
-        mime = entry.mime_type.lower()
-        url = entry.url.lower()
-
-        if 'javascript' in mime or url.endswith('.js'):
-            if entry.content:
-                js_count += 1
-                try:
-                    js_text = entry.content.decode('utf-8')
-                    extracted = extractor.extract_from_js(js_text, entry.url)
-                    all_extracted.extend(extracted)
-                except UnicodeDecodeError:
-                    pass
+    scripts = [
+        (entry.content, entry.url)
+        for entry in entries
+        if is_script_entry(entry) and entry.content
+    ]
+    js_count = len(scripts)
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    workers = min(jobs, js_count)
+    if workers > 1 and sum(len(content) for content, _ in scripts) >= _PARALLEL_SCAN_MIN_BYTES:
+        with nullcontext(executor) if executor else ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            results = list(pool.map(
+                _scan_js_body,
+                [content for content, _ in scripts],
+                [url for _, url in scripts],
+            ))
+    else:
+        results = [_scan_js_body(content, url) for content, url in scripts]
+
+    all_extracted = [style for extracted in results for style in extracted]
 
     # Determine which sources still have no styling
     extracted_urls = {s.tile_url for s in all_extracted if s.tile_url}
@@ -7,7 +7,9 @@ Key requirements:
 - Support zoom level analysis
 """
 
+from collections import Counter
 from dataclasses import dataclass
+from typing import Iterable
 import math
 
 from .detector import TileCoord
@@ -51,22 +53,87 @@ class CoverageCalculator:
 
         return GeoBounds(west=west, south=south, east=east, north=north)
 
-    def calculate_bounds(self, tiles: list[TileCoord]) -> GeoBounds:
-        """Calculate overall bounds from a list of tiles."""
-        if not tiles:
+    def calculate_bounds(self, tiles: Iterable[TileCoord]) -> GeoBounds:
+        """
+        Calculate overall bounds from tiles (any iterable, read once).
+
+        Longitude grows with x and latitude shrinks with y, so only the
+        extreme x/y at each zoom level can contribute to the result. Those
+        are collected in one pass over plain integers, and only a handful
+        of tiles per zoom are converted to degrees.
+        """
+        return self._extents_to_bounds(self._zoom_extents(tiles))
+
+    def calculate_bounds_and_zoom(
+        self, tiles: Iterable[TileCoord]
+    ) -> tuple[GeoBounds, tuple[int, int]]:
+        """
+        Calculate bounds and (min, max) zoom together in a single pass.
+
+        Accepts a generator, so callers need not materialize a list of
+        coordinates just to reduce it.
+        """
+        extents = self._zoom_extents(tiles)
+        return self._extents_to_bounds(extents), (min(extents), max(extents))
+
+    def combine_bounds_and_zoom(
+        self, coverages: Iterable[tuple[GeoBounds, tuple[int, int]]]
+    ) -> tuple[GeoBounds, tuple[int, int]]:
+        """
+        Merge calculate_bounds_and_zoom() results for disjoint tile sets.
+
+        Gives the same result as one call over all the tiles, without
+        another pass over them.
+        """
+        coverages = list(coverages)
+        if not coverages:
             raise ValueError("No tiles provided")
+        return (
+            GeoBounds(
+                west=min(b.west for b, _ in coverages),
+                south=min(b.south for b, _ in coverages),
+                east=max(b.east for b, _ in coverages),
+                north=max(b.north for b, _ in coverages),
+            ),
+            (min(z[0] for _, z in coverages), max(z[1] for _, z in coverages)),
+        )
 
+    def _zoom_extents(self, tiles: Iterable[TileCoord]) -> dict[int, list[int]]:
+        """Collect z -> [min_x, max_x, min_y, max_y] in one pass."""
+        extents: dict[int, list[int]] = {}
+        for z, x, y in tiles:
+            extent = extents.get(z)
+            if extent is None:
+                extents[z] = [x, x, y, y]
+                continue
+            if x < extent[0]:
+                extent[0] = x
+            elif x > extent[1]:
+                extent[1] = x
+            if y < extent[2]:
+                extent[2] = y
+            elif y > extent[3]:
+                extent[3] = y
+
+        if not extents:
+            raise ValueError("No tiles provided")
+        return extents
+
+    def _extents_to_bounds(self, extents: dict[int, list[int]]) -> GeoBounds:
+        """Convert per-zoom tile extents to overall geographic bounds."""
         min_west = float('inf')
         min_south = float('inf')
         max_east = float('-inf')
         max_north = float('-inf')
 
-        for tile in tiles:
-            bounds = self.tile_to_bounds(tile)
-            min_west = min(min_west, bounds.west)
-            min_south = min(min_south, bounds.south)
-            max_east = max(max_east, bounds.east)
-            max_north = max(max_north, bounds.north)
+        for z, (min_x, max_x, min_y, max_y) in extents.items():
+            # Top-left of the extent gives west/north, bottom-right east/south
+            top_left = self.tile_to_bounds(TileCoord(z, min_x, min_y))
+            bottom_right = self.tile_to_bounds(TileCoord(z, max_x, max_y))
+            min_west = min(min_west, top_left.west)
+            max_north = max(max_north, top_left.north)
+            max_east = max(max_east, bottom_right.east)
+            min_south = min(min_south, bottom_right.south)
 
         return GeoBounds(
             west=min_west,
@@ -75,17 +142,17 @@ class CoverageCalculator:
             north=max_north
         )
 
-    def get_zoom_range(self, tiles: list[TileCoord]) -> tuple[int, int]:
-        """Get min and max zoom levels from tiles."""
-        if not tiles:
+    def get_zoom_range(self, tiles: Iterable[TileCoord]) -> tuple[int, int]:
+        """Get min and max zoom levels from tiles (any iterable, read once)."""
+        # Zoom is the first field of a TileCoord or (z, x, y) tuple; the
+        # distinct zooms are few, so reduce over those instead of a list
+        # with one entry per tile
+        zooms = {tile[0] for tile in tiles}
+        if not zooms:
             raise ValueError("No tiles provided")
-
-        zooms = [t.z for t in tiles]
         return (min(zooms), max(zooms))
 
-    def count_by_zoom(self, tiles: list[TileCoord]) -> dict[int, int]:
+    def count_by_zoom(self, tiles: Iterable[TileCoord]) -> dict[int, int]:
         """Count tiles per zoom level."""
-        counts: dict[int, int] = {}
-        for tile in tiles:
-            counts[tile.z] = counts.get(tile.z, 0) + 1
+        counts = Counter(tile[0] for tile in tiles)
         return dict(sorted(counts.items()))
@@ -9,21 +9,26 @@ Key requirements:
 """
 
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, NamedTuple
 import re
 from urllib.parse import urlparse
 
 
-@dataclass(frozen=True)
-class TileCoord:
-    """A single tile's coordinates."""
+# Cheap necessary condition for a tile URL: a known tile extension as a
+# whole word after a dot. Rejects most non-tile requests before the
+# coordinate pattern runs.
+_TILE_EXT_RE = re.compile(r'\.(?:pbf|mvt|png|jpe?g|webp)(?!\w)', re.IGNORECASE)
+
+# Path segments too generic to name a source after
+_NAME_SKIP_SEGMENTS = frozenset({'tiles', 'v3', 'v4', 'v1'})
+
+
+class TileCoord(NamedTuple):
+    """A single tile's coordinates (immutable and hashable)."""
     z: int
     x: int
     y: int
 
-    def __hash__(self):
-        return hash((self.z, self.x, self.y))
-
 
 @dataclass
 class TileSource:
@@ -34,7 +39,7 @@ class TileSource:
     format: str  # pbf, mvt, png, jpg, etc.
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectedTile:
     """A tile detected from a URL."""
     coord: TileCoord
@@ -42,6 +47,12 @@ class DetectedTile:
     content: bytes
 
 
+class TileGroup(NamedTuple):
+    """Tiles grouped under a single source (unpacks as (source, tiles))."""
+    source: TileSource
+    tiles: list[tuple[TileCoord, bytes]]
+
+
 class TileDetector:
     """Detect tiles from URLs and extract coordinates."""
 
@@ -52,12 +63,28 @@ class TileDetector:
     VECTOR_EXTENSIONS = {'pbf', 'mvt'}
     RASTER_EXTENSIONS = {'png', 'jpg', 'jpeg', 'webp'}
 
+    # Tile type by extension: one dict probe per tile instead of two set tests
+    _TILE_TYPES: dict[str, Literal["vector", "raster"]] = {
+        **dict.fromkeys(VECTOR_EXTENSIONS, "vector"),
+        **dict.fromkeys(RASTER_EXTENSIONS, "raster"),
+    }
+
+    def __init__(self):
+        # Sources by URL template, so repeat tiles skip urlparse and naming
+        self._source_cache: dict[str, TileSource] = {}
+        # Source names by URL prefix before z/x/y; templates that differ
+        # only in query string (e.g. rotating API keys) share one entry
+        self._name_cache: dict[str, str] = {}
+
     def detect(self, url: str, content: bytes) -> DetectedTile | None:
         """
         Detect if URL is a tile request and extract info.
 
         Returns DetectedTile if URL matches tile pattern, None otherwise.
         """
+        if not _TILE_EXT_RE.search(url):
+            return None
+
         match = self.COORD_PATTERN.search(url)
         if not match:
             return None
@@ -66,40 +93,45 @@ class TileDetector:
         ext = ext.lower()
 
         # Determine tile type
-        if ext in self.VECTOR_EXTENSIONS:
-            tile_type = "vector"
-        elif ext in self.RASTER_EXTENSIONS:
-            tile_type = "raster"
-        else:
+        tile_type = self._TILE_TYPES.get(ext)
+        if tile_type is None:
             return None
 
-        coord = TileCoord(z=int(z), x=int(x), y=int(y))
-        source = self._create_source(url, ext, tile_type)
+        coord = TileCoord(int(z), int(x), int(y))
+        source = self._create_source(url, match, ext, tile_type)
 
-        return DetectedTile(coord=coord, source=source, content=content)
+        return DetectedTile(coord, source, content)
 
     def _create_source(
         self,
         url: str,
+        match: re.Match,
         ext: str,
         tile_type: Literal["vector", "raster"]
     ) -> TileSource:
-        """Create a TileSource from a URL."""
-        # Create URL template by replacing coordinates with placeholders
-        template = self.COORD_PATTERN.sub(r'/{z}/{x}/{y}.' + ext, url)
+        """Create a TileSource from a URL and its COORD_PATTERN match."""
+        # Create URL template by replacing coordinates with placeholders,
+        # reusing the span detect() already found instead of re-scanning
+        template = f"{url[:match.start()]}/{{z}}/{{x}}/{{y}}.{ext}{url[match.end():]}"
 
-        # Remove query parameters for cleaner template (but keep for name)
-        parsed = urlparse(url)
+        source = self._source_cache.get(template)
+        if source is not None:
+            return source
 
         # Generate source name from domain and path
-        name = self._generate_source_name(parsed)
+        prefix = url[:match.start()]
+        name = self._name_cache.get(prefix)
+        if name is None:
+            name = self._name_cache[prefix] = self._generate_source_name(urlparse(prefix))
 
-        return TileSource(
+        source = TileSource(
             name=name,
             url_template=template,
             tile_type=tile_type,
             format=ext
         )
+        self._source_cache[template] = source
+        return source
 
     def _generate_source_name(self, parsed) -> str:
         """Generate a human-readable source name."""
@@ -108,26 +140,25 @@ class TileDetector:
         domain = domain.split('.')[0]
 
         # Get path segments before z/x/y
-        path_parts = [p for p in parsed.path.split('/') if p and not p.isdigit()]
-        if path_parts:
+        for part in parsed.path.split('/'):
             # Skip common prefixes like 'tiles', 'v3', etc.
-            meaningful = [p for p in path_parts if p not in ('tiles', 'v3', 'v4', 'v1')]
-            if meaningful:
-                return f"{domain}-{meaningful[0]}"
+            if part and not part.isdigit() and part not in _NAME_SKIP_SEGMENTS:
+                return f"{domain}-{part}"
 
         return domain
 
     def group_by_source(
         self,
         tiles: list[DetectedTile]
-    ) -> dict[str, tuple[TileSource, list[tuple[TileCoord, bytes]]]]:
+    ) -> dict[str, TileGroup]:
         """Group detected tiles by their source."""
-        groups: dict[str, tuple[TileSource, list]] = {}
+        groups: dict[str, TileGroup] = {}
 
         for tile in tiles:
             key = tile.source.url_template
-            if key not in groups:
-                groups[key] = (tile.source, [])
-            groups[key][1].append((tile.coord, tile.content))
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = TileGroup(tile.source, [])
+            group.tiles.append((tile.coord, tile.content))
 
         return groups
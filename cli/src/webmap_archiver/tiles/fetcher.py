@@ -232,22 +232,26 @@ class TileFetcher:
         self.timeout = timeout
         self.max_retries = max_retries
         self.user_agent = user_agent
-        self._last_request_time = 0.0
+        self._next_request_time = 0.0
         self._request_count = 0
 
     async def _rate_limit_wait(self):
-        """Wait to respect rate limit."""
+        """
+        Wait to respect rate limit.
+
+        Each caller reserves the next free slot before sleeping, so
+        concurrent requests (including ones for different sources sharing
+        this fetcher) are spaced out rather than released together.
+        """
         if self.rate_limit <= 0:
             return
 
-        now = time.time()
-        min_interval = 1.0 / self.rate_limit
-        elapsed = now - self._last_request_time
-
-        if elapsed < min_interval:
-            await asyncio.sleep(min_interval - elapsed)
+        now = time.monotonic()
+        slot = max(now, self._next_request_time)
+        self._next_request_time = slot + 1.0 / self.rate_limit
 
-        self._last_request_time = time.time()
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
     def _build_url(self, template: str, coord: TileCoord) -> str:
         """Build tile URL from template and coordinates."""
@@ -315,6 +319,8 @@ class TileFetcher:
         coords: list[TileCoord],
         progress_callback: Callable[[int, int, TileCoord | None], None] | None = None,
         concurrency: int = 5,
+        session: "aiohttp.ClientSession | None" = None,
+        semaphore: asyncio.Semaphore | None = None,
     ) -> list[FetchResult]:
         """
         Fetch multiple tiles with progress reporting.
@@ -324,38 +330,47 @@ class TileFetcher:
             coords: List of tile coordinates to fetch
             progress_callback: Called with (completed, total, current_coord)
             concurrency: Number of concurrent requests
+            session: Session to reuse (default: one opened for this call)
+            semaphore: Concurrency limit shared with other calls
+                (default: a new one allowing `concurrency` requests)
 
         Returns:
             List of FetchResult objects
         """
+        if session is None:
+            connector = aiohttp.TCPConnector(limit=concurrency)
+            async with aiohttp.ClientSession(connector=connector) as session:
+                return await self.fetch_tiles(
+                    url_template, coords, progress_callback, concurrency, session, semaphore
+                )
+
         results = []
         total = len(coords)
         completed = 0
 
         # Create semaphore for concurrency control
-        semaphore = asyncio.Semaphore(concurrency)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(concurrency)
 
         async def fetch_with_semaphore(session, coord):
             async with semaphore:
                 url = self._build_url(url_template, coord)
                 return await self.fetch_tile(session, url, coord)
 
-        connector = aiohttp.TCPConnector(limit=concurrency)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            # Process in batches to report progress
-            tasks = []
-            for coord in coords:
-                task = asyncio.create_task(fetch_with_semaphore(session, coord))
-                tasks.append(task)
+        # Process in batches to report progress
+        tasks = []
+        for coord in coords:
+            task = asyncio.create_task(fetch_with_semaphore(session, coord))
+            tasks.append(task)
 
-            # Gather results with progress updates
-            for task in asyncio.as_completed(tasks):
-                result = await task
-                results.append(result)
-                completed += 1
+        # Gather results with progress updates
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            results.append(result)
+            completed += 1
 
-                if progress_callback:
-                    progress_callback(completed, total, result.coord)
+            if progress_callback:
+                progress_callback(completed, total, result.coord)
 
         return results
 
@@ -389,6 +404,9 @@ async def expand_coverage_async(
     rate_limit: float = 10.0,
     max_tiles: int = 2000,
     progress_callback: Callable[[str, int, int], None] | None = None,
+    fetcher: TileFetcher | None = None,
+    session: "aiohttp.ClientSession | None" = None,
+    semaphore: asyncio.Semaphore | None = None,
 ) -> ExpansionResult:
     """
     Expand tile coverage to fill gaps in bounding box.
@@ -402,6 +420,8 @@ async def expand_coverage_async(
         rate_limit: Requests per second limit
         max_tiles: Maximum tiles to fetch (safety limit)
         progress_callback: Called with (source_name, completed, total)
+        fetcher, session, semaphore: Shared with other sources' expansions
+            by expand_many() (default: created for this call)
 
     Returns:
         ExpansionResult with fetched tiles and statistics
@@ -415,9 +435,9 @@ async def expand_coverage_async(
         min_zoom = min(captured_zooms)
         max_zoom = max(captured_zooms)
         target_max_zoom = min(18, max_zoom + expand_zoom)  # Cap at z18
-        print(f"    Captured zoom range: z{min_zoom}-z{max_zoom}", flush=True)
+        print(f"    {source_name}: captured zoom range: z{min_zoom}-z{max_zoom}", flush=True)
         print(
-            f"    Target zoom range: z{min_zoom}-z{target_max_zoom} (expand by {expand_zoom})",
+            f"    {source_name}: target zoom range: z{min_zoom}-z{target_max_zoom} (expand by {expand_zoom})",
             flush=True,
         )
 
@@ -433,10 +453,10 @@ async def expand_coverage_async(
     for zoom, coords in missing.items():
         all_missing.extend(coords)
 
-    print(f"    Missing tiles in target range: {len(all_missing)}", flush=True)
+    print(f"    {source_name}: missing tiles in target range: {len(all_missing)}", flush=True)
 
     if not all_missing:
-        print(f"    No tiles to fetch - coverage is complete", flush=True)
+        print(f"    {source_name}: no tiles to fetch - coverage is complete", flush=True)
         return ExpansionResult(
             source_name=source_name,
             original_count=len(captured_tiles),
@@ -449,21 +469,28 @@ async def expand_coverage_async(
 
     # Safety limit
     if len(all_missing) > max_tiles:
-        print(f"    Limiting to {max_tiles} tiles (was {len(all_missing)})", flush=True)
+        print(f"    {source_name}: limiting to {max_tiles} tiles (was {len(all_missing)})", flush=True)
         # Prioritize higher zoom levels (more detail)
         all_missing.sort(key=lambda c: -c.z)
         all_missing = all_missing[:max_tiles]
 
-    print(f"    Fetching {len(all_missing)} tiles...", flush=True)
+    print(f"    {source_name}: fetching {len(all_missing)} tiles...", flush=True)
 
     # Fetch missing tiles
-    fetcher = TileFetcher(rate_limit=rate_limit)
+    if fetcher is None:
+        fetcher = TileFetcher(rate_limit=rate_limit)
 
     def fetch_progress(completed, total, coord):
         if progress_callback:
             progress_callback(source_name, completed, total)
 
-    results = await fetcher.fetch_tiles(url_template, all_missing, progress_callback=fetch_progress)
+    results = await fetcher.fetch_tiles(
+        url_template,
+        all_missing,
+        progress_callback=fetch_progress,
+        session=session,
+        semaphore=semaphore,
+    )
 
     # Process results
     new_tiles = []
@@ -480,7 +507,7 @@ async def expand_coverage_async(
                 errors.append(f"{result.coord}: {result.error}")
 
     failed_count = len(all_missing) - len(new_tiles)
-    print(f"    Fetched {len(new_tiles)} tiles, {failed_count} failed", flush=True)
+    print(f"    {source_name}: fetched {len(new_tiles)} tiles, {failed_count} failed", flush=True)
 
     return ExpansionResult(
         source_name=source_name,
@@ -518,6 +545,65 @@ def expand_coverage(
     )
 
 
+@dataclass
+class ExpansionSpec:
+    """One tile source to expand with expand_many()."""
+
+    url_template: str
+    source_name: str
+    captured_tiles: list[tuple[TileCoord, bytes]]
+    bounds: GeoBounds
+    expand_zoom: int = 0
+
+
+async def expand_many(
+    specs: list[ExpansionSpec],
+    rate_limit: float = 10.0,
+    concurrency: int = 5,
+    progress_callback: Callable[[str, int, int], None] | None = None,
+) -> list[ExpansionResult]:
+    """
+    Expand coverage for several sources at once.
+
+    All sources share one HTTP session (so connections to a common host
+    are reused), one concurrency limit and one rate limit: together they
+    make no more requests than a single source would on its own.
+
+    Returns one ExpansionResult per spec, in the same order.
+    """
+    fetcher = TileFetcher(rate_limit=rate_limit)
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(*(
+            expand_coverage_async(
+                url_template=spec.url_template,
+                source_name=spec.source_name,
+                captured_tiles=spec.captured_tiles,
+                bounds=spec.bounds,
+                expand_zoom=spec.expand_zoom,
+                progress_callback=progress_callback,
+                fetcher=fetcher,
+                session=session,
+                semaphore=semaphore,
+            )
+            for spec in specs
+        ))
+
+
+def expand_coverage_many(
+    specs: list[ExpansionSpec],
+    rate_limit: float = 10.0,
+    progress_callback: Callable[[str, int, int], None] | None = None,
+) -> list[ExpansionResult]:
+    """
+    Synchronous wrapper for expand_many.
+    """
+    return asyncio.run(
+        expand_many(specs, rate_limit=rate_limit, progress_callback=progress_callback)
+    )
+
+
 def analyze_coverage(
     captured_tiles: list[tuple[TileCoord, bytes]], bounds: GeoBounds, expand_zoom: int = 0
 ) -> CoverageReport:
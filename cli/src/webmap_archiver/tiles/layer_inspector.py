@@ -17,6 +17,24 @@ This module provides both:
 import gzip
 import re
 from dataclasses import dataclass
+from typing import Iterator
+
+# A length byte (3-60) immediately followed by an identifier start character.
+# Zero-width lookahead so overlapping candidates are all reported.
+_CANDIDATE_RE = re.compile(rb'(?=[\x03-\x3c][A-Za-z_])', re.DOTALL)
+_IDENTIFIER_BYTES_RE = re.compile(rb'[A-Za-z_][A-Za-z0-9_]*')
+
+_LAYER_MATCH = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z').match
+
+# Layer discovery stops after this many sampled tiles add no new names
+_STABLE_SAMPLE_TILES = 2
+
+# Common non-layer strings that appear in tiles
+_REJECT = frozenset({
+    'Arial', 'Helvetica', 'Sans', 'Bold', 'Regular', 'Medium',
+    'true', 'false', 'null', 'undefined',
+    'name', 'class', 'type', 'id',  # These are property names, not layers
+})
 
 
 @dataclass
@@ -34,7 +52,7 @@ class TileLayerInfo:
 def decompress_tile(content: bytes) -> bytes:
     """Decompress tile if gzipped."""
     # Check for gzip magic number
-    if content[:2] == b'\x1f\x8b':
+    if content.startswith(b'\x1f\x8b'):
         try:
             return gzip.decompress(content)
         except Exception:
@@ -67,60 +85,42 @@ def extract_layer_names_simple(tile_content: bytes) -> list[str]:
     # - Are 2-50 characters long
     # - Often include meaningful words like "road", "water", "building", etc.
     
-    # Scan through bytes looking for ASCII strings
-    i = 0
-    while i < len(content) - 2:
-        # Look for potential string length byte followed by printable ASCII
-        potential_len = content[i]
-        if 2 <= potential_len <= 60:  # Reasonable layer name length
-            # Check if next bytes could be a layer name
-            start = i + 1
-            end = start + potential_len
-            if end <= len(content):
-                try:
-                    candidate = content[start:end].decode('utf-8')
-                    # Check if it looks like a layer name
-                    if _is_valid_layer_name(candidate):
-                        layer_names.add(candidate)
-                except (UnicodeDecodeError, ValueError):
-                    pass
-        i += 1
-    
+    # Let the regex engine find length-byte + identifier-start positions so
+    # the Python loop only visits plausible candidates, not every byte
+    content_len = len(content)
+    for match in _CANDIDATE_RE.finditer(content):
+        i = match.start()
+        start = i + 1
+        end = start + content[i]
+        if end > content_len:
+            continue
+        if _IDENTIFIER_BYTES_RE.fullmatch(content, start, end) is None:
+            continue
+        candidate = content[start:end].decode('ascii')
+        if _is_valid_layer_name(candidate):
+            layer_names.add(candidate)
+
     return sorted(layer_names)
 
 
 def _is_valid_layer_name(s: str) -> bool:
     """Check if string looks like a valid layer name."""
-    if not s:
-        return False
-    
-    # Must start with letter or underscore
-    if not (s[0].isalpha() or s[0] == '_'):
-        return False
-    
-    # Must contain only valid characters
-    if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', s):
-        return False
-    
-    # Reject common non-layer strings that appear in tiles
-    reject_patterns = {
-        'Arial', 'Helvetica', 'Sans', 'Bold', 'Regular', 'Medium',
-        'true', 'false', 'null', 'undefined',
-        'name', 'class', 'type', 'id',  # These are property names, not layers
-    }
-    if s in reject_patterns:
-        return False
-    
-    # Layer names typically are longer than 3 chars
-    if len(s) < 3:
-        return False
-    
-    return True
+    # Cheapest checks first: layer names are typically longer than 3 chars,
+    # then reject known non-layer strings, then the identifier pattern
+    return (
+        len(s) >= 3
+        and s not in _REJECT
+        and _LAYER_MATCH(s) is not None
+    )
 
 
-def extract_layer_names_protobuf(tile_content: bytes) -> list[str]:
+def iter_layer_names_protobuf(tile_content: bytes) -> Iterator[str]:
     """
-    Extract source-layer names from MVT protobuf content.
+    Yield source-layer names from MVT protobuf content as they are decoded.
+
+    Only the name field of each Layer is read; the rest of the Layer body
+    (features, keys, values) is skipped by length. Being a generator, the
+    caller can stop pulling once it has seen enough.
 
     MVT protobuf structure:
     message Tile {
@@ -131,45 +131,58 @@ def extract_layer_names_protobuf(tile_content: bytes) -> list[str]:
         repeated Feature features = 2;
         ...
     }
-
-    Returns:
-        List of layer names found in the tile
     """
     content = decompress_tile(tile_content)
-    layer_names = []
+    end = len(content)
 
-    # Parse protobuf manually (simplified for MVT)
     pos = 0
-    while pos < len(content):
-        # Read field tag
-        if pos >= len(content):
-            break
-
+    while pos < end:
         tag_byte = content[pos]
-        field_num = tag_byte >> 3
-        wire_type = tag_byte & 0x07
         pos += 1
 
-        if field_num == 3 and wire_type == 2:  # Layer field (length-delimited)
-            # Read length (varint)
-            length, pos = _read_varint(content, pos)
-            if length is None or pos + length > len(content):
+        if tag_byte != 0x1a:  # Not a Layer field (field 3, length-delimited)
+            pos = _skip_field(content, pos, tag_byte & 0x07)
+            if pos is None:
+                return
+            continue
+
+        length, pos = _read_varint(content, pos)
+        if length is None or pos + length > end:
+            return
+        layer_end = pos + length
+
+        # Scan the Layer body in place for its name field
+        while pos < layer_end:
+            layer_tag = content[pos]
+            pos += 1
+            if layer_tag == 0x0a:  # name field (field 1, length-delimited)
+                name_len, pos = _read_varint(content, pos)
+                if name_len is None or pos + name_len > layer_end:
+                    break
+                try:
+                    name = content[pos:pos + name_len].decode('utf-8')
+                except UnicodeDecodeError:
+                    name = None
+                if name:
+                    yield name
                 break
-
-            # Parse layer submessage
-            layer_data = content[pos:pos + length]
-            layer_info = _parse_layer(layer_data)
-            if layer_info and layer_info.name:
-                layer_names.append(layer_info.name)
-
-            pos += length
-        else:
-            # Skip unknown field
-            pos = _skip_field(content, pos, wire_type)
+            pos = _skip_field(content, pos, layer_tag & 0x07)
             if pos is None:
                 break
 
-    return layer_names
+        pos = layer_end
+
+
+def extract_layer_names_protobuf(tile_content: bytes) -> list[str]:
+    """
+    Extract source-layer names from MVT protobuf content.
+
+    See iter_layer_names_protobuf() for the streaming version.
+
+    Returns:
+        List of layer names found in the tile
+    """
+    return list(iter_layer_names_protobuf(tile_content))
 
 
 def extract_layer_info_protobuf(tile_content: bytes) -> list[TileLayerInfo]:
@@ -183,36 +196,30 @@ def extract_layer_info_protobuf(tile_content: bytes) -> list[TileLayerInfo]:
         List of TileLayerInfo objects with names and metadata
     """
     content = decompress_tile(tile_content)
+    end = len(content)
     layers = []
 
     # Parse protobuf manually (simplified for MVT)
     pos = 0
-    while pos < len(content):
-        # Read field tag
-        if pos >= len(content):
-            break
-
+    while pos < end:
         tag_byte = content[pos]
-        field_num = tag_byte >> 3
-        wire_type = tag_byte & 0x07
         pos += 1
 
-        if field_num == 3 and wire_type == 2:  # Layer field (length-delimited)
+        if tag_byte == 0x1a:  # Layer field (field 3, length-delimited)
             # Read length (varint)
             length, pos = _read_varint(content, pos)
-            if length is None or pos + length > len(content):
+            if length is None or pos + length > end:
                 break
 
-            # Parse layer submessage
-            layer_data = content[pos:pos + length]
-            layer_info = _parse_layer(layer_data)
+            # Parse layer submessage in place, without slicing it out
+            layer_info = _parse_layer(content, pos, pos + length)
             if layer_info and layer_info.name:
                 layers.append(layer_info)
 
             pos += length
         else:
             # Skip unknown field
-            pos = _skip_field(content, pos, wire_type)
+            pos = _skip_field(content, pos, tag_byte & 0x07)
             if pos is None:
                 break
 
@@ -221,9 +228,20 @@ def extract_layer_info_protobuf(tile_content: bytes) -> list[TileLayerInfo]:
 
 def _read_varint(data: bytes, pos: int) -> tuple[int | None, int]:
     """Read a varint from data at position."""
+    # Fast paths: MVT tags and most lengths fit in one or two bytes
+    end = len(data)
+    if pos < end:
+        byte = data[pos]
+        if byte < 0x80:
+            return byte, pos + 1
+        if pos + 1 < end:
+            byte2 = data[pos + 1]
+            if byte2 < 0x80:
+                return (byte & 0x7f) | (byte2 << 7), pos + 2
+
     result = 0
     shift = 0
-    while pos < len(data):
+    while pos < end:
         byte = data[pos]
         pos += 1
         result |= (byte & 0x7f) << shift
@@ -252,41 +270,48 @@ def _skip_field(data: bytes, pos: int, wire_type: int) -> int | None:
     return None
 
 
-def _parse_layer(layer_data: bytes) -> TileLayerInfo | None:
-    """Parse a Layer submessage to extract name and basic info."""
-    pos = 0
+def _parse_layer(
+    data: bytes,
+    start: int = 0,
+    end: int | None = None,
+) -> TileLayerInfo | None:
+    """
+    Parse a Layer submessage to extract name and basic info.
+
+    The Layer is read in place from data[start:end] (the whole buffer by
+    default), so callers don't need to copy it out of the tile first.
+    """
+    pos = start
+    if end is None:
+        end = len(data)
     name = None
     feature_count = 0
-    
-    while pos < len(layer_data):
-        if pos >= len(layer_data):
-            break
-            
-        tag_byte = layer_data[pos]
-        field_num = tag_byte >> 3
-        wire_type = tag_byte & 0x07
+
+    while pos < end:
+        tag_byte = data[pos]
         pos += 1
-        
-        if field_num == 1 and wire_type == 2:  # name field
-            length, pos = _read_varint(layer_data, pos)
-            if length is None or pos + length > len(layer_data):
+
+        if tag_byte == 0x12:  # features field (field 2, length-delimited)
+            # Only counted, so skip the body by its length without decoding
+            feature_count += 1
+            length, pos = _read_varint(data, pos)
+            if length is None:
+                break
+            pos += length
+        elif tag_byte == 0x0a:  # name field (field 1, length-delimited)
+            length, pos = _read_varint(data, pos)
+            if length is None or pos + length > end:
                 break
             try:
-                name = layer_data[pos:pos + length].decode('utf-8')
+                name = data[pos:pos + length].decode('utf-8')
             except UnicodeDecodeError:
                 pass
             pos += length
-        elif field_num == 2 and wire_type == 2:  # features field
-            feature_count += 1
-            length, pos = _read_varint(layer_data, pos)
-            if length is None:
-                break
-            pos += length
         else:
-            pos = _skip_field(layer_data, pos, wire_type)
+            pos = _skip_field(data, pos, tag_byte & 0x07)
             if pos is None:
                 break
-    
+
     if name:
         return TileLayerInfo(name=name, feature_count=feature_count)
     return None
@@ -296,7 +321,8 @@ def discover_layers_from_tiles(tiles: list[tuple]) -> list[str]:
     """
     Discover all unique source-layer names from a list of tiles.
 
-    Samples tiles across the set to find all layers.
+    Samples up to 10 tiles, stopping early once consecutive tiles stop
+    contributing new layer names.
 
     Args:
         tiles: List of (coord, content) tuples
@@ -304,19 +330,27 @@ def discover_layers_from_tiles(tiles: list[tuple]) -> list[str]:
     Returns:
         List of unique layer names
     """
-    all_layers = []
+    # dict-as-ordered-set: O(1) membership, keeps first-seen order
+    all_layers: dict[str, None] = {}
+    tiles_without_new = 0
 
     # Sample up to 10 tiles
     sample_size = min(10, len(tiles))
 
     for i in range(sample_size):
         coord, content = tiles[i]
-        layers = extract_layer_names_protobuf(content)
-        for layer in layers:
-            if layer not in all_layers:
-                all_layers.append(layer)
+        known = len(all_layers)
+        for layer in iter_layer_names_protobuf(content):
+            all_layers.setdefault(layer, None)
 
-    return all_layers
+        if len(all_layers) > known:
+            tiles_without_new = 0
+        else:
+            tiles_without_new += 1
+            if all_layers and tiles_without_new >= _STABLE_SAMPLE_TILES:
+                break
+
+    return list(all_layers)
 
 
 def discover_layer_info_from_tiles(tiles: list[tuple[any, bytes]]) -> dict[str, TileLayerInfo]:
@@ -338,32 +372,33 @@ def discover_layer_info_from_tiles(tiles: list[tuple[any, bytes]]) -> dict[str,
     # Different zoom levels might have different layers
     sample_size = min(10, len(tiles))
 
-    # Get tiles from different zoom levels if possible
-    by_zoom: dict[int, list] = {}
-    for coord, content in tiles:
-        z = coord.z if hasattr(coord, 'z') else coord[0]
-        if z not in by_zoom:
-            by_zoom[z] = []
-        by_zoom[z].append(content)
-
-    # Sample from each zoom level
+    # Get tiles from different zoom levels if possible: take up to 3 per
+    # zoom in a single pass, stopping as soon as the sample is full
+    per_zoom_count: dict[int, int] = {}
     sampled = []
-    for z in sorted(by_zoom.keys()):
-        sampled.extend(by_zoom[z][:3])  # Up to 3 tiles per zoom
-        if len(sampled) >= sample_size:
-            break
+    for coord, content in tiles:
+        z = coord[0]  # TileCoord or plain (z, x, y) tuple
+        count = per_zoom_count.get(z, 0)
+        if count < 3:
+            sampled.append(content)
+            per_zoom_count[z] = count + 1
+            if len(sampled) >= sample_size:
+                break
 
     # Extract layers from sampled tiles
     for content in sampled:
+        # Decompress once; both parsers pass already-raw bytes through as-is
+        content = decompress_tile(content)
         try:
             # Try protobuf parser first (more accurate)
             layer_infos = extract_layer_info_protobuf(content)
             for info in layer_infos:
-                if info.name not in all_layers:
+                existing = all_layers.get(info.name)
+                if existing is None:
                     all_layers[info.name] = info
                 else:
                     # Aggregate feature counts
-                    all_layers[info.name].feature_count += info.feature_count
+                    existing.feature_count += info.feature_count
         except Exception:
             # Fall back to simple extraction
             names = extract_layer_names_simple(content)
@@ -4,21 +4,94 @@ Build PMTiles archives from tiles.
 Key requirements:
 - Support vector tiles (pbf format)
 - Set proper metadata (bounds, zoom range, etc.)
-- Handle tile compression (gzip)
+- Handle tile compression (gzip, or none for vector tiles)
 
 Note: Uses the pmtiles Python library.
 """
 
-from pathlib import Path
-from dataclasses import dataclass
-import gzip
 import io
+import logging
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable
 
-from pmtiles.tile import TileType, Compression, zxy_to_tileid
+from pmtiles.tile import Compression, TileType
 from pmtiles.writer import Writer
 
-from .detector import TileCoord, TileSource
+# Optional: ISA-L's SIMD-accelerated gzip, API-compatible with stdlib gzip
+try:
+    from isal import igzip as _gzip
+    ISAL_AVAILABLE = True
+except ImportError:
+    import gzip as _gzip
+    ISAL_AVAILABLE = False
+
 from .coverage import GeoBounds
+from .detector import TileCoord, TileSource
+
+logger = logging.getLogger(__name__)
+
+# Number of tiles in all zoom levels below z, i.e. the first tile ID at z
+_ZOOM_BASE_IDS = tuple(((1 << (z * 2)) - 1) // 3 for z in range(32))
+
+# Smallest possible gzip member: 10-byte header + empty deflate block + 8-byte trailer
+_GZIP_MIN_SIZE = 18
+_GZIP_MAX_ISIZE = 256 * 1024 * 1024
+
+# ISA-L supports levels 0-3; its level 2 is comparable in ratio to zlib's 6
+_GZIP_LEVEL = 2 if ISAL_AVAILABLE else 6
+
+# zlib window bits that emit a gzip header/trailer directly (16 + MAX_WBITS)
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+# Below this many tiles, thread start-up costs more than it saves
+_PARALLEL_GZIP_MIN_TILES = 64
+
+# Tiles handed to the thread pool per batch; bounds how many encoded
+# payloads are held before the writer consumes them
+_PARALLEL_GZIP_BATCH_TILES = 1024
+
+# Tiles up to this size are encoded once per distinct payload. Small
+# tiles (empty ocean/land) repeat heavily; large ones almost never do.
+_DEDUP_MAX_TILE_BYTES = 4096
+
+# Tile compressions PMTilesBuilder can write for vector tiles. Raster
+# tiles are always stored as-is. zstd/brotli are left out: the bundled
+# viewer's pmtiles.js can only decode gzip.
+VECTOR_TILE_COMPRESSIONS = ("gzip", "none")
+
+# Archives with up to this many bytes of tile data are built in memory by
+# build_for_archive(); larger ones still go through output_path on disk
+_IN_MEMORY_MAX_BYTES = 64 * 1024 * 1024
+
+# In-memory archives are held by the packager until it builds the ZIP, so
+# in_memory_limits() caps their combined tile data at this many bytes
+_IN_MEMORY_TOTAL_BYTES = 256 * 1024 * 1024
+
+# Below this many tiles in total, map_builds() builds sources inline;
+# starting spawn workers costs more than the parallel build saves
+PARALLEL_BUILD_MIN_TILES = 4096
+
+
+def _has_valid_gzip_framing(data: bytes) -> bool:
+    """
+    Check gzip header and trailer fields without decompressing.
+
+    Verifies the magic bytes, the DEFLATE method byte, that no reserved
+    flag bits are set, and that the trailing ISIZE is plausible for a tile.
+    """
+    if len(data) < _GZIP_MIN_SIZE or not data.startswith(b'\x1f\x8b\x08'):
+        return False
+    if data[3] & 0xE0:
+        return False
+    isize = int.from_bytes(data[-4:], 'little')
+    return 0 < isize < _GZIP_MAX_ISIZE
 
 
 @dataclass
@@ -34,11 +107,86 @@ class PMTilesMetadata:
     vector_layers: list[dict] | None = None  # TileJSON vector_layers spec
 
 
+def _gzip_compress(data: bytes) -> bytes:
+    """Gzip-compress a tile with ISA-L, or a raw zlib gzip stream."""
+    if ISAL_AVAILABLE:
+        return _gzip.compress(data, compresslevel=_GZIP_LEVEL)
+    # Skips the GzipFile/BytesIO layers; zlib writes the gzip framing in C
+    compressor = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _encode_once(encode: Callable[[bytes], bytes]) -> Callable[[bytes], bytes]:
+    """
+    Wrap a tile encoder so repeated small payloads are encoded only once.
+
+    Identical input then also yields the identical output object, so the
+    Writer's content hash dedup stores it once even when the encoder
+    isn't deterministic (gzip headers carry a timestamp).
+    """
+    encoded: dict[bytes, bytes] = {}
+
+    def encode_tile(data: bytes) -> bytes:
+        if len(data) > _DEDUP_MAX_TILE_BYTES:
+            return encode(data)
+        result = encoded.get(data)
+        if result is None:
+            result = encoded[data] = encode(data)
+        return result
+
+    return encode_tile
+
+
+def _tile_ids(coords: list[TileCoord]) -> list[int]:
+    """
+    Compute PMTiles Hilbert tile IDs for many coordinates at once.
+
+    Same result as pmtiles.tile.zxy_to_tileid, but with the per-zoom base
+    offset precomputed and the quadrant rotation inlined, which avoids a
+    function call per bit of every tile.
+    """
+    ids = []
+    append = ids.append
+    for coord in coords:
+        z, x, y = coord.z, coord.x, coord.y
+        if z > 31:
+            raise OverflowError("tile zoom exceeds 64-bit limit")
+        n = 1 << z
+        if not (0 <= x < n and 0 <= y < n):
+            raise ValueError("tile x/y outside zoom level bounds")
+
+        acc = _ZOOM_BASE_IDS[z]
+        a = z - 1
+        while a >= 0:
+            s = 1 << a
+            rx = s & x
+            ry = s & y
+            acc += ((3 * rx) ^ ry) << a
+            if not ry:
+                if rx:
+                    x = s - 1 - x
+                    y = s - 1 - y
+                x, y = y, x
+            a -= 1
+        append(acc)
+    return ids
+
+
 class PMTilesBuilder:
     """Build a PMTiles archive from tiles."""
 
-    def __init__(self, output_path: Path):
+    def __init__(
+        self,
+        output_path: Path,
+        tile_compression: str = "gzip",
+        gzip_threads: int | None = None,
+    ):
+        if tile_compression not in VECTOR_TILE_COMPRESSIONS:
+            raise ValueError(f"Unsupported tile compression: {tile_compression}")
         self.output_path = Path(output_path)
+        self.tile_compression = tile_compression
+        # Threads for vector tile (de)compression; None uses every CPU
+        self.gzip_threads = gzip_threads
         self.tiles: list[tuple[TileCoord, bytes]] = []
         self.metadata: PMTilesMetadata | None = None
 
@@ -46,12 +194,21 @@ class PMTilesBuilder:
         """Add a tile to the archive."""
         self.tiles.append((coord, data))
 
+    def add_tiles(self, tiles: Iterable[tuple[TileCoord, bytes]]) -> None:
+        """
+        Add many (coord, data) tiles to the archive in one call.
+
+        Tiles are only collected here; ordering by tile ID and compression
+        happen once, for the whole set, in build().
+        """
+        self.tiles.extend(tiles)
+
     def set_metadata(self, metadata: PMTilesMetadata) -> None:
         """Set archive metadata."""
         self.metadata = metadata
 
-    def build(self) -> None:
-        """Build and write the PMTiles archive."""
+    def _prepare(self) -> TileType:
+        """Validate the builder state and resolve the PMTiles tile type."""
         if not self.tiles:
             raise ValueError("No tiles to write")
 
@@ -71,52 +228,113 @@ class PMTilesBuilder:
             }
             tile_type = format_map.get(self.metadata.format, TileType.PNG)
 
-        # VALIDATION: Check sample tile content
-        sample_coord, sample_data = self.tiles[0]
-        print(f"  [PMTiles] Sample tile z{sample_coord.z}/{sample_coord.x}/{sample_coord.y}")
-        print(f"    Size: {len(sample_data)} bytes")
-        print(f"    First 10 bytes: {sample_data[:10].hex()}")
-        print(f"    Is gzipped: {len(sample_data) >= 2 and sample_data[:2] == b'\\x1f\\x8b'}")
-        print(f"    Tile type: {tile_type.name}")
+        # VALIDATION: Check sample tile content (debug logging only)
+        if logger.isEnabledFor(logging.DEBUG):
+            sample_coord, sample_data = self.tiles[0]
+            logger.debug(
+                "Sample tile z%d/%d/%d: %d bytes, first 10 bytes %s, gzipped=%s, type=%s",
+                sample_coord.z, sample_coord.x, sample_coord.y,
+                len(sample_data),
+                sample_data[:10].hex(),
+                sample_data.startswith(b'\x1f\x8b'),
+                tile_type.name,
+            )
 
-        # Open writer
+        return tile_type
+
+    def build(self) -> None:
+        """Build and write the PMTiles archive."""
+        tile_type = self._prepare()
         with open(self.output_path, 'wb') as f:
-            writer = Writer(f)
-
-            # Write tiles
-            for coord, data in self.tiles:
-                # Ensure vector tiles are gzipped
-                if tile_type == TileType.MVT:
-                    data = self._ensure_gzipped(data)
-
-                tile_id = zxy_to_tileid(coord.z, coord.x, coord.y)
-                writer.write_tile(tile_id, data)
-
-            # Write header with metadata
-            header = {
-                "tile_type": tile_type,
-                "tile_compression": Compression.GZIP if tile_type == TileType.MVT else Compression.NONE,
-                "min_zoom": self.metadata.min_zoom,
-                "max_zoom": self.metadata.max_zoom,
-                "min_lon_e7": int(self.metadata.bounds.west * 1e7),
-                "min_lat_e7": int(self.metadata.bounds.south * 1e7),
-                "max_lon_e7": int(self.metadata.bounds.east * 1e7),
-                "max_lat_e7": int(self.metadata.bounds.north * 1e7),
-                "center_lon_e7": int(self.metadata.bounds.center[0] * 1e7),
-                "center_lat_e7": int(self.metadata.bounds.center[1] * 1e7),
-                "center_zoom": (self.metadata.min_zoom + self.metadata.max_zoom) // 2,
-            }
+            self._write(f, tile_type)
 
-            json_metadata = {
-                "name": self.metadata.name,
-                "description": self.metadata.description,
-            }
+    def build_bytes(self) -> bytes:
+        """
+        Build the archive in memory and return its bytes.
 
-            # Add vector_layers for MVT tiles (required by TileJSON spec)
-            if self.metadata.vector_layers is not None:
-                json_metadata["vector_layers"] = self.metadata.vector_layers
+        Same output as build(), without writing output_path; lets callers
+        embed small archives directly instead of round-tripping a temp file.
+        """
+        tile_type = self._prepare()
+        buffer = io.BytesIO()
+        self._write(buffer, tile_type)
+        return buffer.getvalue()
+
+    def build_for_archive(self, max_in_memory_bytes: int | None = None) -> Path | bytes:
+        """
+        Build the archive for ArchivePackager.add_pmtiles.
+
+        Returns the archive bytes when the tiles fit under max_in_memory_bytes
+        (default: the per-source limit), otherwise writes output_path and
+        returns it. Pass the limits from in_memory_limits() when building
+        several sources for one archive.
+        """
+        if max_in_memory_bytes is None:
+            max_in_memory_bytes = _IN_MEMORY_MAX_BYTES
+        if sum(len(data) for _, data in self.tiles) <= max_in_memory_bytes:
+            return self.build_bytes()
+        self.build()
+        return self.output_path
 
-            writer.finalize(header, json_metadata)
+    def _write(self, f: BinaryIO, tile_type: TileType) -> None:
+        """Write tiles, header and metadata to a binary file object."""
+        writer = Writer(f)
+
+        # Write tiles in tile-ID order so the archive is clustered
+        tiles = self.tiles
+        tile_ids = _tile_ids([coord for coord, _ in tiles])
+        order = sorted(range(len(tile_ids)), key=tile_ids.__getitem__)
+
+        gzipped = tile_type == TileType.MVT and self.tile_compression == "gzip"
+        encode = _encode_once(self._ensure_gzipped if gzipped else self._ensure_uncompressed)
+
+        if tile_type != TileType.MVT:
+            # Raster tiles are handed to the writer as-is, no copies
+            for i in order:
+                writer.write_tile(tile_ids[i], tiles[i][1])
+        elif len(order) >= _PARALLEL_GZIP_MIN_TILES:
+            # Bring vector tiles to the target encoding. zlib releases
+            # the GIL, so larger sets are (de)compressed across a thread
+            # pool. Tiles are submitted one batch at a time, so at most a
+            # batch of encoded payloads waits on the (slower) writer.
+            with ThreadPoolExecutor(max_workers=self.gzip_threads or os.cpu_count()) as executor:
+                for start in range(0, len(order), _PARALLEL_GZIP_BATCH_TILES):
+                    batch = order[start:start + _PARALLEL_GZIP_BATCH_TILES]
+                    payloads = executor.map(encode, (tiles[i][1] for i in batch))
+                    for i, data in zip(batch, payloads):
+                        writer.write_tile(tile_ids[i], data)
+        else:
+            for i in order:
+                writer.write_tile(tile_ids[i], encode(tiles[i][1]))
+
+        # Write header with metadata
+        metadata = self.metadata
+        bounds = metadata.bounds
+        center_lon, center_lat = bounds.center
+        header = {
+            "tile_type": tile_type,
+            "tile_compression": Compression.GZIP if gzipped else Compression.NONE,
+            "min_zoom": metadata.min_zoom,
+            "max_zoom": metadata.max_zoom,
+            "min_lon_e7": int(bounds.west * 1e7),
+            "min_lat_e7": int(bounds.south * 1e7),
+            "max_lon_e7": int(bounds.east * 1e7),
+            "max_lat_e7": int(bounds.north * 1e7),
+            "center_lon_e7": int(center_lon * 1e7),
+            "center_lat_e7": int(center_lat * 1e7),
+            "center_zoom": (metadata.min_zoom + metadata.max_zoom) // 2,
+        }
+
+        json_metadata = {
+            "name": self.metadata.name,
+            "description": self.metadata.description,
+        }
+
+        # Add vector_layers for MVT tiles (required by TileJSON spec)
+        if self.metadata.vector_layers is not None:
+            json_metadata["vector_layers"] = self.metadata.vector_layers
+
+        writer.finalize(header, json_metadata)
 
     def _ensure_gzipped(self, data: bytes) -> bytes:
         """
@@ -126,10 +344,13 @@ class PMTilesBuilder:
         Double-gzipping corrupts the data and prevents tiles from loading.
         """
         # Check if already gzipped (magic bytes: 0x1f 0x8b)
-        if len(data) >= 2 and data[:2] == b'\x1f\x8b':
-            # Validate it's actually valid gzip by attempting decompression
+        if data.startswith(b'\x1f\x8b'):
+            # Cheap structural check first; a full decompression is only
+            # needed when the header or trailer looks suspicious
+            if _has_valid_gzip_framing(data):
+                return data
             try:
-                gzip.decompress(data)
+                _gzip.decompress(data)
                 # Valid gzip - return as-is to avoid double compression
                 return data
             except Exception:
@@ -137,7 +358,65 @@ class PMTilesBuilder:
                 pass
 
         # Not gzipped - compress it
-        buf = io.BytesIO()
-        with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=6) as gz:
-            gz.write(data)
-        return buf.getvalue()
+        return _gzip_compress(data)
+
+    def _ensure_uncompressed(self, data: bytes) -> bytes:
+        """Strip gzip from a tile that arrived compressed; pass others through."""
+        if data.startswith(b'\x1f\x8b'):
+            try:
+                return _gzip.decompress(data)
+            except Exception:
+                # Magic bytes by coincidence; keep the payload as captured
+                pass
+        return data
+
+
+def map_builds(
+    build: Callable[..., Any],
+    builds: list[tuple],
+    total_tiles: int,
+    jobs: int,
+    executor: Executor | None = None,
+) -> list:
+    """
+    Run build(*args) for every args tuple in builds, returning results in order.
+
+    Sources are independent, so with at least PARALLEL_BUILD_MIN_TILES
+    tiles in total they are built in up to `jobs` worker processes: layer
+    discovery, tile IDs and the writer's hashing are pure Python and
+    would otherwise serialize on the GIL. build must be module-level so
+    it pickles. Parallel builds run on executor if one is given, otherwise
+    on a spawn pool started for this call.
+
+    In workers, build is also passed gzip_threads, a share of the CPUs for
+    each builder's gzip thread pool, so the processes don't oversubscribe.
+    """
+    workers = min(jobs, len(builds))
+    if workers > 1 and total_tiles >= PARALLEL_BUILD_MIN_TILES:
+        gzip_threads = max(1, (os.cpu_count() or 1) // workers)
+        with nullcontext(executor) if executor else ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            return list(pool.map(partial(build, gzip_threads=gzip_threads), *zip(*builds)))
+    return [build(*args) for args in builds]
+
+
+def in_memory_limits(tile_sets: Iterable[list[tuple[TileCoord, bytes]]]) -> list[int]:
+    """
+    Split the archive-wide in-memory budget across sources, in order.
+
+    Returns one build_for_archive() limit per tile set: the per-source
+    limit while the running total of in-memory tile data stays within
+    _IN_MEMORY_TOTAL_BYTES, and 0 (build on disk) once it would not.
+    """
+    limits = []
+    remaining = _IN_MEMORY_TOTAL_BYTES
+    for tiles in tile_sets:
+        size = sum(len(data) for _, data in tiles)
+        if size <= min(_IN_MEMORY_MAX_BYTES, remaining):
+            limits.append(_IN_MEMORY_MAX_BYTES)
+            remaining -= size
+        else:
+            limits.append(0)
+    return limits
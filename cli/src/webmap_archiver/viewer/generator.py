@@ -13,9 +13,20 @@ captured style.json. The viewer MUST render these "orphan" sources with sensible
 default styling. This is the primary use case, not an edge case.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from string import Formatter
+from typing import Iterator, NamedTuple
+import gzip
 import json
+import math
+
+# Optional: orjson's C serializer for the embedded config JSON
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from ..tiles.coverage import GeoBounds
 
@@ -31,6 +42,16 @@ class ViewerConfig:
     created_at: str
     captured_style: dict | None = None  # Full MapLibre style from map.getStyle()
 
+    # Serialized config JSON, filled on first generate() and reused by later
+    # generate()/write() calls. Treat the config as read-only once rendered.
+    _config_json: str | None = field(default=None, init=False, repr=False, compare=False)
+
+
+# Color palette for data layers WITHOUT extracted styling
+_DEFAULT_COLORS = (
+    "#e41a1c", "#377eb8", "#4daf4a", "#984ea3",
+    "#ff7f00", "#ffff33", "#a65628", "#f781bf",
+)
 
 # Large HTML template - viewer with MapLibre GL JS and PMTiles support
 VIEWER_TEMPLATE = '''<!DOCTYPE html>
@@ -39,6 +60,7 @@ VIEWER_TEMPLATE = '''<!DOCTYPE html>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{name} - WebMap Archive</title>
+    <link rel="preconnect" href="https://unpkg.com" />
     <link href="https://unpkg.com/maplibre-gl@3.6.2/dist/maplibre-gl.css" rel="stylesheet" />
     <script src="https://unpkg.com/maplibre-gl@3.6.2/dist/maplibre-gl.js"></script>
     <script src="https://unpkg.com/pmtiles@3.0.7/dist/pmtiles.js"></script>
@@ -102,29 +124,13 @@ VIEWER_TEMPLATE = '''<!DOCTYPE html>
         // Archive configuration
         const config = {config_json};
 
-        // Color palette for data layers WITHOUT extracted styling
-        const DEFAULT_COLORS = [
-            "#e41a1c", "#377eb8", "#4daf4a", "#984ea3",
-            "#ff7f00", "#ffff33", "#a65628", "#f781bf"
-        ];
-        let colorIndex = 0;
-
-        // Function to generate default style (fallback when no captured style)
+        // @captured
+        // Background-only fallback when the captured style file can't be loaded
         function generateDefaultStyle() {{
-            console.log("[WebMap Archiver] No captured style, generating default style");
-            // Build sources object
-            const sources = {{}};
-            config.tileSources.forEach(src => {{
-                sources[src.name] = {{
-                    type: "vector",
-                    url: "pmtiles://" + src.path
-                }};
-            }});
-
-            // Create style with layers for ALL sources
+            console.log("[WebMap Archiver] Falling back to default style");
             return {{
                 version: 8,
-                sources: sources,
+                sources: config.defaultSources,
                 layers: [
                     {{
                         id: "background",
@@ -134,235 +140,48 @@ VIEWER_TEMPLATE = '''<!DOCTYPE html>
                 ]
             }};
         }}
+        // @end
 
         // Main initialization function
         async function initMap() {{
             let style;
 
-            // Check if we have a captured style from map.getStyle()
-            if (config.capturedStyle) {{
-                console.log("[WebMap Archiver] Using captured style from map.getStyle()");
-
-                // Load style from external file to ensure it's processed before map creation
-                try {{
-                    const response = await fetch('style/captured_style.json');
-                    if (!response.ok) {{
-                        throw new Error(`Failed to load style: ${{response.status}}`);
-                    }}
-                    style = await response.json();
-                    console.log(`[WebMap Archiver] Loaded style with ${{style.layers?.length || 0}} layers`);
-                }} catch (error) {{
-                    console.error("[WebMap Archiver] Failed to load captured style, falling back to default:", error);
-                    style = generateDefaultStyle();
-                }}
-
-                // CRITICAL: Resolve sprite and glyph URLs to absolute paths BEFORE map creation
-                // MapLibre requires absolute URLs and validates them during style parsing
-                if (style.sprite && !style.sprite.startsWith('http') && !style.sprite.startsWith('data:')) {{
-                    const baseUrl = window.location.href.substring(0, window.location.href.lastIndexOf('/') + 1);
-                    style.sprite = baseUrl + style.sprite.replace(/^\\.?\\//, '');
-                    console.log(`[WebMap Archiver] Resolved sprite URL: ${{style.sprite}}`);
-                }}
-                if (style.glyphs && !style.glyphs.startsWith('http') && !style.glyphs.startsWith('data:')) {{
-                    const baseUrl = window.location.href.substring(0, window.location.href.lastIndexOf('/') + 1);
-                    style.glyphs = baseUrl + style.glyphs.replace(/^\\.?\\//, '');
-                    console.log(`[WebMap Archiver] Resolved glyphs URL: ${{style.glyphs}}`);
-                }}
+            // @captured
+            // Use the captured style from map.getStyle()
+            console.log("[WebMap Archiver] Using captured style from map.getStyle()");
 
-                // Simplify font stacks to single fonts to match captured glyph files
-                // MapLibre requests fonts as comma-separated lists, but we only have individual files
-                if (style.layers) {{
-                    let fontSimplificationCount = 0;
-                    style.layers.forEach(layer => {{
-                        if (layer.layout && Array.isArray(layer.layout['text-font'])) {{
-                            const fonts = layer.layout['text-font'];
-                            if (fonts.length > 1) {{
-                                layer.layout['text-font'] = [fonts[0]];
-                                fontSimplificationCount++;
-                            }}
-                        }}
-                    }});
-                    if (fontSimplificationCount > 0) {{
-                        console.log(`[WebMap Archiver] Simplified ${{fontSimplificationCount}} font stacks to single fonts`);
-                    }}
+            // Load style from external file to ensure it's processed before map creation
+            try {{
+                const response = await fetch('style/captured_style.json');
+                if (!response.ok) {{
+                    throw new Error(`Failed to load style: ${{response.status}}`);
                 }}
-            }} else {{
+                style = await response.json();
+                console.log(`[WebMap Archiver] Loaded style with ${{style.layers?.length || 0}} layers`);
+            }} catch (error) {{
+                console.error("[WebMap Archiver] Failed to load captured style, falling back to default:", error);
                 style = generateDefaultStyle();
             }}
 
-            // Track layers for toggle controls
-            const layerGroups = {{}};
-
-            // Helper to build color expression from extracted colors
-            function buildColorExpression(colors, sourceLayer) {{
-                if (!colors || Object.keys(colors).length === 0) {{
-                    return null;
-                }}
-
-                // Build a case expression: ["case", condition1, color1, condition2, color2, ..., default]
-                const expr = ["case"];
-                for (const [category, color] of Object.entries(colors)) {{
-                    if (category !== 'unknown' && category !== 'other' && color) {{
-                        // Assume properties are boolean flags (==1 means true)
-                        expr.push(["==", ["get", category], 1]);
-                        expr.push(color);
-                    }}
-                }}
-                // Default color
-                expr.push(colors.unknown || colors.other || "#888888");
-
-                return expr;
+            // CRITICAL: Resolve sprite and glyph URLs to absolute paths BEFORE map creation
+            // MapLibre requires absolute URLs and validates them during style parsing.
+            // prepare_captured_style() already made local paths page-relative.
+            const baseUrl = window.location.href.substring(0, window.location.href.lastIndexOf('/') + 1);
+            if (style.sprite && !style.sprite.startsWith('http') && !style.sprite.startsWith('data:')) {{
+                style.sprite = baseUrl + style.sprite;
+                console.log(`[WebMap Archiver] Resolved sprite URL: ${{style.sprite}}`);
             }}
+            if (style.glyphs && !style.glyphs.startsWith('http') && !style.glyphs.startsWith('data:')) {{
+                style.glyphs = baseUrl + style.glyphs;
+                console.log(`[WebMap Archiver] Resolved glyphs URL: ${{style.glyphs}}`);
+            }}
+            // @default
+            // Default style and its layer groups are built at archive time
+            style = config.precomputedStyle;
+            // @end
 
-            // Add layers for each source (only if not using captured style)
-            if (!config.capturedStyle) {{
-                config.tileSources.forEach((src, i) => {{
-                const isDataLayer = src.isOrphan !== false;
-                const extracted = src.extractedStyle;
-                const layerIds = [];
-
-                // Check if we have override layers (from map.getStyle())
-                // These are the exact layer definitions from the original map
-                if (extracted?.overrideLayers && extracted.overrideLayers.length > 0) {{
-                    console.log("Using override layers for", src.name, ":", extracted.overrideLayers.length, "layers");
-
-                    extracted.overrideLayers.forEach((layerDef, idx) => {{
-                        // Clone the layer definition and update source reference
-                        const layer = JSON.parse(JSON.stringify(layerDef));
-                        layer.id = src.name + "-" + (layer.id || idx);
-                        layer.source = src.name;
-
-                        // Ensure source-layer is set correctly
-                        if (!layer["source-layer"] && extracted.sourceLayer) {{
-                            layer["source-layer"] = extracted.sourceLayer;
-                        }}
-
-                        style.layers.push(layer);
-                        layerIds.push(layer.id);
-                    }});
-
-                    layerGroups[src.name] = {{
-                        label: src.name + " (original style)",
-                        layers: layerIds,
-                        isData: isDataLayer,
-                        hasExtractedStyle: true,
-                        sourceLayers: extracted.allLayers || []
-                    }};
-                    return; // Skip the default layer generation
-                }}
-
-                // Determine colors to use (for non-override case)
-                let color;
-                let colorExpr = null;
-
-                if (extracted && extracted.colors && Object.keys(extracted.colors).length > 0) {{
-                    // Use extracted colors - build expression
-                    colorExpr = buildColorExpression(extracted.colors, extracted.sourceLayer);
-                    color = Object.values(extracted.colors)[0];  // Fallback single color
-                    console.log("Using extracted colors for", src.name, "confidence:", extracted.confidence);
-                }} else {{
-                    // Fall back to default palette
-                    color = isDataLayer ? DEFAULT_COLORS[colorIndex++ % DEFAULT_COLORS.length] : "#4a4a6a";
-                }}
-
-                const layerType = extracted?.layerType || "line";
-
-                // Get all discovered source layers, or fall back to single sourceLayer
-                // This comes from actual tile inspection and is reliable
-                let sourceLayers = extracted?.allLayers || [];
-                if (sourceLayers.length === 0 && extracted?.sourceLayer) {{
-                    sourceLayers = [extracted.sourceLayer];
-                }}
-
-                // If we have discovered source layers, create a layer for each
-                // If not, create layers without source-layer (will try to render all)
-                if (sourceLayers.length > 0) {{
-                    console.log("Creating layers for source", src.name, "with discovered layers:", sourceLayers);
-
-                    sourceLayers.forEach((sourceLayer, idx) => {{
-                        const suffix = sourceLayers.length > 1 ? `-${{idx}}` : '';
-
-                        // Line layer
-                        if (layerType === "line" || !isDataLayer || !extracted) {{
-                            const lineId = src.name + "-line" + suffix;
-                            style.layers.push({{
-                                id: lineId,
-                                type: "line",
-                                source: src.name,
-                                "source-layer": sourceLayer,
-                                paint: {{
-                                    "line-color": colorExpr || color,
-                                    "line-width": isDataLayer ? 2 : 1,
-                                    "line-opacity": isDataLayer ? 0.9 : 0.5
-                                }}
-                            }});
-                            layerIds.push(lineId);
-                        }}
-
-                        // Fill layer for polygons
-                        if (layerType === "fill" || !extracted) {{
-                            const fillId = src.name + "-fill" + suffix;
-                            style.layers.push({{
-                                id: fillId,
-                                type: "fill",
-                                source: src.name,
-                                "source-layer": sourceLayer,
-                                filter: ["==", ["geometry-type"], "Polygon"],
-                                paint: {{
-                                    "fill-color": colorExpr || color,
-                                    "fill-opacity": isDataLayer ? 0.4 : 0.2
-                                }}
-                            }});
-                            layerIds.push(fillId);
-                        }}
-
-                        // Circle layer for points
-                        if (layerType === "circle" || !extracted) {{
-                            const circleId = src.name + "-circle" + suffix;
-                            style.layers.push({{
-                                id: circleId,
-                                type: "circle",
-                                source: src.name,
-                                "source-layer": sourceLayer,
-                                filter: ["==", ["geometry-type"], "Point"],
-                                paint: {{
-                                    "circle-color": colorExpr || color,
-                                    "circle-radius": isDataLayer ? 6 : 3,
-                                    "circle-stroke-color": "#ffffff",
-                                    "circle-stroke-width": isDataLayer ? 1 : 0
-                                }}
-                            }});
-                            layerIds.push(circleId);
-                        }}
-                    }});
-                }} else {{
-                    // No source layers discovered - this shouldn't happen for vector tiles
-                    // but handle gracefully by omitting source-layer
-                    console.warn("No source layers discovered for", src.name, "- layers may not render correctly");
-
-                    const lineId = src.name + "-line";
-                    style.layers.push({{
-                        id: lineId,
-                        type: "line",
-                        source: src.name,
-                        paint: {{
-                            "line-color": color,
-                            "line-width": 2,
-                            "line-opacity": 0.9
-                        }}
-                    }});
-                    layerIds.push(lineId);
-                }}
-
-                layerGroups[src.name] = {{
-                    label: src.name + (extracted?.confidence ? ` (${{Math.round(extracted.confidence * 100)}}% styled)` : ""),
-                    layers: layerIds,
-                    isData: isDataLayer,
-                    hasExtractedStyle: !!(extracted && extracted.colors && Object.keys(extracted.colors).length > 0),
-                    sourceLayers: sourceLayers
-                }};
-                }});
-            }} // End if (!config.capturedStyle)
+            // Track layers for toggle controls
+            const layerGroups = config.layerGroups || {{}};
 
             // Transform request handler for glyphs only
             // Sprites are handled by URL resolution before map creation
@@ -371,22 +190,15 @@ VIEWER_TEMPLATE = '''<!DOCTYPE html>
                 // MapLibre may request multiple fonts in one path like "Font1,Font2/0-255.pbf"
                 // But we only have individual font files, so use the first font in the list
                 if (resourceType === 'Glyphs') {{
-                    // Check if URL contains comma-separated fonts
-                    const match = url.match(/\/glyphs\/([^/]+)\/(\d+-\d+\.pbf)/);
-                    if (match) {{
-                        const fontStacks = match[1];
-                        const range = match[2];
-
-                        // If multiple fonts (contains comma), use only the first one
-                        if (fontStacks.includes(',')) {{
-                            const firstFont = fontStacks.split(',')[0];
-                            const newUrl = url.replace(
-                                `/glyphs/${{fontStacks}}/${{range}}`,
-                                `/glyphs/${{firstFont}}/${{range}}`
-                            );
-                            console.log(`[Glyphs] Multi-font request fallback: ${{fontStacks}} -> using ${{firstFont}}`);
-                            return {{ url: newUrl }};
-                        }}
+                    // Plain string scans; no regex on the request path
+                    const start = url.indexOf('/glyphs/') + 8;
+                    const end = start > 7 ? url.indexOf('/', start) : -1;
+                    const comma = end > 0 ? url.indexOf(',', start) : -1;
+
+                    // If multiple fonts (contains comma), use only the first one
+                    if (comma > 0 && comma < end) {{
+                        console.log(`[Glyphs] Multi-font request fallback: ${{url.slice(start, end)}} -> using ${{url.slice(start, comma)}}`);
+                        return {{ url: url.slice(0, comma) + url.slice(end) }};
                     }}
                 }}
 
@@ -397,9 +209,9 @@ VIEWER_TEMPLATE = '''<!DOCTYPE html>
             const map = new maplibregl.Map({{
                 container: "map",
                 style: style,
-                center: [{center_lon}, {center_lat}],
-                zoom: {initial_zoom},
-                maxBounds: [[{west}, {south}], [{east}, {north}]],
+                center: config.center,
+                zoom: config.initialZoom,
+                maxBounds: config.maxBounds,
                 transformRequest: transformRequest
             }});
 
@@ -468,46 +280,397 @@ VIEWER_TEMPLATE = '''<!DOCTYPE html>
 '''
 
 
+def _dumps_config(obj: dict) -> str:
+    """
+    Serialize the viewer config as compact JSON with non-ASCII kept as-is.
+
+    Uses orjson when installed. Anything orjson cannot encode (e.g. non-str
+    keys in a captured source dict) falls back to the stdlib encoder.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def _select_branch(template: str, branch: str) -> str:
+    """
+    Keep one style branch of the template and drop the other.
+
+    Lines between a '// @captured' or '// @default' marker and the next
+    marker or '// @end' belong to that branch; marker lines are removed.
+    Raises ValueError for an unknown branch or marker, an '// @end' with
+    no open branch, or a branch left open at the end of the template, so
+    a broken template fails at import rather than shipping the wrong code.
+    """
+    if branch not in ('captured', 'default'):
+        raise ValueError(f"Unknown template branch: {branch}")
+    lines = []
+    current = None
+    for number, line in enumerate(template.splitlines(keepends=True), 1):
+        marker = line.strip()
+        if marker in ('// @captured', '// @default'):
+            current = marker[4:]
+        elif marker == '// @end':
+            if current is None:
+                raise ValueError(f"Template line {number}: '// @end' with no open branch")
+            current = None
+        elif marker.startswith('// @'):
+            raise ValueError(f"Template line {number}: unknown marker {marker!r}")
+        elif current is None or current == branch:
+            lines.append(line)
+    if current is not None:
+        raise ValueError(f"Template ends inside the '// @{current}' branch")
+    return ''.join(lines)
+
+
+class _CompiledTemplate(NamedTuple):
+    """A template split into literal chunks around its field names."""
+    chunks: list[str]
+    fields: list[str]
+    chunks_bytes: list[bytes]  # UTF-8 chunks for write(); only values are encoded per call
+
+
+def _precompile(template: str) -> _CompiledTemplate:
+    """
+    Split a str.format template into literal chunks and field names once.
+
+    len(chunks) == len(fields) + 1, so the rendered output is
+    chunks[0] + value(fields[0]) + chunks[1] + ...
+    Literals come back with {{ }} escapes already resolved, so rendering is
+    a plain join with no brace scanning or field parsing per call.
+    """
+    chunks = ['']
+    fields = []
+    for literal, field_name, _, _ in Formatter().parse(template):
+        chunks[-1] += literal
+        if field_name is not None:
+            fields.append(field_name)
+            chunks.append('')
+    return _CompiledTemplate(chunks, fields, [chunk.encode('utf-8') for chunk in chunks])
+
+
+# The page only ever runs one style branch, known at generate time, so each
+# variant ships without the other's JavaScript
+_TEMPLATE_CAPTURED = _precompile(_select_branch(VIEWER_TEMPLATE, 'captured'))
+_TEMPLATE_DEFAULT = _precompile(_select_branch(VIEWER_TEMPLATE, 'default'))
+
+
+def _render(template: _CompiledTemplate, values: dict[str, str]) -> str:
+    """Render a precompiled viewer template with string field values."""
+    chunks = template.chunks
+    parts = [chunks[0]]
+    for field_name, chunk in zip(template.fields, chunks[1:]):
+        parts.append(values[field_name])
+        parts.append(chunk)
+    return ''.join(parts)
+
+
+def _page_relative(url: str) -> str:
+    """Strip a leading './' or '/' from a local resource path."""
+    if url.startswith(('http', 'data:')):
+        return url
+    if url.startswith('./'):
+        return url[2:]
+    if url.startswith('/'):
+        return url[1:]
+    return url
+
+
+def prepare_captured_style(style: dict) -> dict:
+    """
+    Normalize a captured style before it is written as style/captured_style.json.
+
+    Local sprite and glyph paths are made relative to viewer.html, so the
+    viewer only has to prefix its base URL at load time. Font stacks are
+    reduced to their first font: MapLibre requests a stack as one
+    comma-separated glyph path, but only individual font files are
+    captured. Modifies the style in place and returns it.
+    """
+    for key in ("sprite", "glyphs"):
+        # Multi-sprite styles use a list of {id, url}; those are left alone
+        if isinstance(style.get(key), str):
+            style[key] = _page_relative(style[key])
+
+    for layer in style.get("layers") or ():
+        layout = layer.get("layout")
+        if layout:
+            fonts = layout.get("text-font")
+            if isinstance(fonts, list) and len(fonts) > 1:
+                layout["text-font"] = [fonts[0]]
+    return style
+
+
+def _color_expression(colors: dict) -> list:
+    """
+    Build a MapLibre case expression from extracted category colors.
+
+    Categories are assumed to be boolean feature properties (== 1 means
+    true); 'unknown'/'other' supply the default color.
+    """
+    expr: list = ["case"]
+    for category, color in colors.items():
+        if category != 'unknown' and category != 'other' and color:
+            expr.append(["==", ["get", category], 1])
+            expr.append(color)
+    expr.append(colors.get('unknown') or colors.get('other') or "#888888")
+    return expr
+
+
 class ViewerGenerator:
     """Generate HTML viewer for archived maps."""
 
     def generate(self, config: ViewerConfig) -> str:
         """Generate viewer HTML from configuration."""
-        center = config.bounds.center
+        return _render(self._template(config), self._field_values(config))
+
+    def _template(self, config: ViewerConfig) -> _CompiledTemplate:
+        """Pick the template variant for the config's style branch."""
+        return _TEMPLATE_CAPTURED if config.captured_style else _TEMPLATE_DEFAULT
+
+    def _field_values(self, config: ViewerConfig) -> dict[str, str]:
+        """Build the string value for every template field."""
+        config_json = config._config_json
+        if config_json is None:
+            config_json = config._config_json = _dumps_config(self._config_dict(config))
 
-        # Build config JSON for JavaScript
+        return {
+            "name": config.name,
+            "created_at": config.created_at,
+            "min_zoom": f"{config.min_zoom}",
+            "max_zoom": f"{config.max_zoom}",
+            "source_count": f"{len(config.tile_sources)}",
+            "config_json": config_json,
+        }
+
+    def _config_dict(self, config: ViewerConfig) -> dict:
+        """Build the config object embedded in the viewer for JavaScript."""
+        default_sources = {
+            src["name"]: {"type": "vector", "url": f"pmtiles://{src['path']}"}
+            for src in config.tile_sources
+        }
+        bounds = config.bounds
+        west, south, east, north = bounds.west, bounds.south, bounds.east, bounds.north
+        min_zoom, max_zoom = config.min_zoom, config.max_zoom
         config_dict = {
             "name": config.name,
-            "bounds": {
-                "west": config.bounds.west,
-                "south": config.bounds.south,
-                "east": config.bounds.east,
-                "north": config.bounds.north,
-            },
-            "minZoom": config.min_zoom,
-            "maxZoom": config.max_zoom,
-            "tileSources": config.tile_sources,
+            "bounds": {"west": west, "south": south, "east": east, "north": north},
+            "minZoom": min_zoom,
+            "maxZoom": max_zoom,
+            # Initial map view, read by the MapLibre constructor
+            "center": list(bounds.center),
+            "initialZoom": (min_zoom + max_zoom) // 2,
+            "maxBounds": [[west, south], [east, north]],
+            # Extracted styling (colors, override layers) is already folded
+            # into precomputedStyle, so only the source descriptors are kept
+            "tileSources": [
+                {key: value for key, value in src.items() if key != "extractedStyle"}
+                for src in config.tile_sources
+            ],
             "createdAt": config.created_at,
             "capturedStyle": bool(config.captured_style),  # Flag indicating if captured style exists (actual style loaded from file)
+            # PMTiles sources for the fallback style, so the page doesn't rebuild them on load
+            "defaultSources": default_sources,
         }
-
-        return VIEWER_TEMPLATE.format(
-            name=config.name,
-            created_at=config.created_at,
-            min_zoom=config.min_zoom,
-            max_zoom=config.max_zoom,
-            source_count=len(config.tile_sources),
-            config_json=json.dumps(config_dict, indent=2),
-            center_lon=center[0],
-            center_lat=center[1],
-            initial_zoom=(config.min_zoom + config.max_zoom) // 2,
-            west=config.bounds.west,
-            south=config.bounds.south,
-            east=config.bounds.east,
-            north=config.bounds.north,
-        )
-
-    def write(self, config: ViewerConfig, output_path: Path) -> None:
-        """Generate and write viewer to file."""
-        html = self.generate(config)
-        output_path.write_text(html, encoding='utf-8')
+        if not config.captured_style:
+            style, layer_groups = self._build_default_style(config, default_sources)
+            config_dict["precomputedStyle"] = style
+            config_dict["layerGroups"] = layer_groups
+        return config_dict
+
+    def _build_default_style(
+        self,
+        config: ViewerConfig,
+        sources: dict[str, dict],
+    ) -> tuple[dict, dict[str, dict]]:
+        """
+        Build the viewer's default style when there is no captured style.
+
+        Each source gets its override layers from map.getStyle() if present,
+        otherwise line/fill/circle layers per discovered source layer, colored
+        from extracted colors or the default palette. Returns the style and
+        the layer groups used by the viewer's toggle controls.
+        """
+        layers: list[dict] = [{
+            "id": "background",
+            "type": "background",
+            "paint": {"background-color": "#1a1a2e"},
+        }]
+        layer_groups: dict[str, dict] = {}
+        color_index = 0
+
+        for src in config.tile_sources:
+            name = src["name"]
+            is_data_layer = src.get("isOrphan") is not False
+            extracted = src.get("extractedStyle")
+            layer_ids = []
+
+            # Override layers are the exact layer definitions from the original map
+            override_layers = extracted.get("overrideLayers") if extracted is not None else None
+            if override_layers:
+                for idx, layer_def in enumerate(override_layers):
+                    # Only top-level keys are rewritten, so a shallow copy keeps
+                    # the caller's layer untouched; nested paint/layout/filter
+                    # objects are shared and only ever serialized
+                    layer = dict(layer_def)
+                    layer["id"] = f"{name}-{layer.get('id') or idx}"
+                    layer["source"] = name
+
+                    # Ensure source-layer is set correctly
+                    if not layer.get("source-layer") and extracted.get("sourceLayer"):
+                        layer["source-layer"] = extracted["sourceLayer"]
+
+                    layers.append(layer)
+                    layer_ids.append(layer["id"])
+
+                layer_groups[name] = {
+                    "label": f"{name} (original style)",
+                    "layers": layer_ids,
+                    "isData": is_data_layer,
+                    "hasExtractedStyle": True,
+                    "sourceLayers": extracted.get("allLayers") or [],
+                }
+                continue
+
+            # Determine colors to use (for non-override case)
+            colors = extracted.get("colors") if extracted is not None else None
+            if colors:
+                color_expr = _color_expression(colors)
+                color = next(iter(colors.values()))  # Fallback single color
+            else:
+                color_expr = None
+                if is_data_layer:
+                    color = _DEFAULT_COLORS[color_index % len(_DEFAULT_COLORS)]
+                    color_index += 1
+                else:
+                    color = "#4a4a6a"
+            paint_color = color_expr or color
+
+            layer_type = (extracted.get("layerType") if extracted is not None else None) or "line"
+
+            # All discovered source layers, or fall back to the single sourceLayer
+            source_layers = (extracted.get("allLayers") if extracted is not None else None) or []
+            if not source_layers and extracted is not None and extracted.get("sourceLayer"):
+                source_layers = [extracted["sourceLayer"]]
+
+            if source_layers:
+                for idx, source_layer in enumerate(source_layers):
+                    suffix = f"-{idx}" if len(source_layers) > 1 else ""
+
+                    # Line layer
+                    if layer_type == "line" or not is_data_layer or extracted is None:
+                        layer_id = f"{name}-line{suffix}"
+                        layers.append({
+                            "id": layer_id,
+                            "type": "line",
+                            "source": name,
+                            "source-layer": source_layer,
+                            "paint": {
+                                "line-color": paint_color,
+                                "line-width": 2 if is_data_layer else 1,
+                                "line-opacity": 0.9 if is_data_layer else 0.5,
+                            },
+                        })
+                        layer_ids.append(layer_id)
+
+                    # Fill layer for polygons
+                    if layer_type == "fill" or extracted is None:
+                        layer_id = f"{name}-fill{suffix}"
+                        layers.append({
+                            "id": layer_id,
+                            "type": "fill",
+                            "source": name,
+                            "source-layer": source_layer,
+                            "filter": ["==", ["geometry-type"], "Polygon"],
+                            "paint": {
+                                "fill-color": paint_color,
+                                "fill-opacity": 0.4 if is_data_layer else 0.2,
+                            },
+                        })
+                        layer_ids.append(layer_id)
+
+                    # Circle layer for points
+                    if layer_type == "circle" or extracted is None:
+                        layer_id = f"{name}-circle{suffix}"
+                        layers.append({
+                            "id": layer_id,
+                            "type": "circle",
+                            "source": name,
+                            "source-layer": source_layer,
+                            "filter": ["==", ["geometry-type"], "Point"],
+                            "paint": {
+                                "circle-color": paint_color,
+                                "circle-radius": 6 if is_data_layer else 3,
+                                "circle-stroke-color": "#ffffff",
+                                "circle-stroke-width": 1 if is_data_layer else 0,
+                            },
+                        })
+                        layer_ids.append(layer_id)
+            else:
+                # No source layers discovered - shouldn't happen for vector
+                # tiles, but handle gracefully by omitting source-layer
+                layer_id = f"{name}-line"
+                layers.append({
+                    "id": layer_id,
+                    "type": "line",
+                    "source": name,
+                    "paint": {
+                        "line-color": color,
+                        "line-width": 2,
+                        "line-opacity": 0.9,
+                    },
+                })
+                layer_ids.append(layer_id)
+
+            confidence = extracted.get("confidence") if extracted is not None else None
+            label = name
+            if confidence:
+                # Math.round semantics, as the viewer used to compute this label
+                label += f" ({math.floor(confidence * 100 + 0.5)}% styled)"
+
+            layer_groups[name] = {
+                "label": label,
+                "layers": layer_ids,
+                "isData": is_data_layer,
+                "hasExtractedStyle": bool(colors),
+                "sourceLayers": source_layers,
+            }
+
+        style = {"version": 8, "sources": sources, "layers": layers}
+        return style, layer_groups
+
+    def write(self, config: ViewerConfig, output_path: Path, precompress: bool = True) -> None:
+        """
+        Generate and write viewer to file.
+
+        Streams each template chunk and field value straight to the file,
+        so the full page is never held in memory as one string. With
+        precompress, a gzipped copy is written alongside (viewer.html.gz)
+        for servers that can send it with Content-Encoding: gzip; mtime=0
+        keeps it byte-identical across runs.
+        """
+        output_path = Path(output_path)
+        if not precompress:
+            with open(output_path, 'wb') as f:
+                f.writelines(self._iter_bytes(config))
+            return
+
+        gz_path = output_path.with_name(output_path.name + '.gz')
+        with open(output_path, 'wb') as f, open(gz_path, 'wb') as gz_file:
+            with gzip.GzipFile(filename='', mode='wb', fileobj=gz_file,
+                               compresslevel=9, mtime=0) as gz:
+                for chunk in self._iter_bytes(config):
+                    f.write(chunk)
+                    gz.write(chunk)
+
+    def _iter_bytes(self, config: ViewerConfig) -> Iterator[bytes]:
+        """Yield the viewer HTML as UTF-8 template chunks and field values, in order."""
+        template = self._template(config)
+        values = self._field_values(config)
+        chunks = template.chunks_bytes
+        yield chunks[0]
+        for field_name, chunk in zip(template.fields, chunks[1:]):
+            yield values[field_name].encode('utf-8')
+            yield chunk
@@ -140,3 +140,47 @@ def test_inspect_bundle_empty_warning():
     assert result.is_valid
     # Note: The warning is only shown if there's no style, HAR, or tiles
     # This bundle is technically valid but empty
+
+
+def test_create_archive_expanded_zoom_range(tmp_path, monkeypatch):
+    """Test that coverage expansion is reflected in the archive's zoom range."""
+    import json
+    import zipfile
+
+    from pmtiles.reader import MemorySource, Reader
+
+    from webmap_archiver.tiles import fetcher
+    from webmap_archiver.tiles.coverage import TileCoord
+
+    async def fake_expand(**kwargs):
+        tiles = kwargs["captured_tiles"]
+        coord, data = tiles[0]
+        new_tiles = [(TileCoord(coord.z + 1, coord.x * 2, coord.y * 2), data)]
+        return fetcher.ExpansionResult(
+            kwargs["source_name"], len(tiles), 1, 0, 0, new_tiles, []
+        )
+
+    monkeypatch.setattr(fetcher, "AIOHTTP_AVAILABLE", True)
+    monkeypatch.setattr(fetcher, "expand_coverage_async", fake_expand)
+
+    bundle = {
+        "version": "1.0",
+        "metadata": {"url": "https://test.com", "capturedAt": "2024-01-01T00:00:00Z"},
+        "viewport": {"center": [0, 0], "zoom": 10},
+        "tiles": [
+            {"sourceId": "data", "z": 10, "x": 301, "y": 385, "data": "GgA=", "format": "pbf",
+             "url": "https://tiles.test.com/data/10/301/385.pbf"},
+        ]
+    }
+    output_path = tmp_path / "archive.zip"
+
+    result = create_archive_from_bundle(bundle, output_path, expand_coverage=True)
+
+    assert result.zoom_range == (10, 11)
+    assert result.tile_count == 2
+    with zipfile.ZipFile(output_path) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+        header = Reader(MemorySource(zf.read("tiles/data.pmtiles"))).header()
+    assert manifest["zoom_range"] == [10, 11]
+    assert manifest["tile_sources"][0]["zoom_range"] == [10, 11]
+    assert (header["min_zoom"], header["max_zoom"]) == (10, 11)
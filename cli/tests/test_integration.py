@@ -2,13 +2,33 @@
 Integration tests for webmap-archiver using real HAR data.
 """
 
+import gzip
+import json
+import os
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pathlib import Path
+from pmtiles.reader import MemorySource, MmapSource, Reader
+from pmtiles.tile import Compression, zxy_to_tileid
 
+from webmap_archiver.har import parser as har_parser
 from webmap_archiver.har.parser import HARParser
 from webmap_archiver.har.classifier import RequestClassifier, RequestType
 from webmap_archiver.tiles.detector import TileDetector
-from webmap_archiver.tiles.coverage import CoverageCalculator
+from webmap_archiver.tiles.coverage import CoverageCalculator, GeoBounds, TileCoord
+from webmap_archiver.tiles import pmtiles as pmtiles_module
+from webmap_archiver.tiles.pmtiles import (
+    PARALLEL_BUILD_MIN_TILES, PMTilesBuilder, PMTilesMetadata,
+    _has_valid_gzip_framing, _tile_ids, in_memory_limits, map_builds,
+)
+from webmap_archiver.archive.packager import ArchivePackager
+from webmap_archiver.viewer.generator import (
+    VIEWER_TEMPLATE, ViewerConfig, ViewerGenerator, _TEMPLATE_DEFAULT,
+    _precompile, _render, _select_branch, prepare_captured_style,
+)
 
 FIXTURES = Path(__file__).parent / "fixtures"
 HAR_FILE = FIXTURES / "parkingregulations.nyc.har"
@@ -39,6 +59,41 @@ def test_har_parsing(har_entries):
     assert len(successful) > 50, "HAR file should have many successful responses"
 
 
+def test_har_parsing_prefetched(har_entries):
+    """Test that background-thread parsing yields the same entries in order."""
+    parser = HARParser(HAR_FILE)
+    prefetched = list(parser.iter_entries_prefetched(maxsize=4))
+    assert [e.url for e in prefetched] == [e.url for e in har_entries]
+
+
+def test_har_parsing_gzip(har_entries, tmp_path):
+    """Test that a gzip-compressed HAR parses to the same entries."""
+    gz_path = tmp_path / "capture.har.gz"
+    gz_path.write_bytes(gzip.compress(HAR_FILE.read_bytes()))
+    entries = HARParser(gz_path).parse()
+    assert [e.url for e in entries] == [e.url for e in har_entries]
+    assert [e.content for e in entries] == [e.content for e in har_entries]
+
+
+def test_har_parsing_zstd(har_entries, tmp_path):
+    """Test that a zstd-compressed HAR parses to the same entries."""
+    zstandard = pytest.importorskip("zstandard")
+    zst_path = tmp_path / "capture.har.zst"
+    zst_path.write_bytes(zstandard.ZstdCompressor().compress(HAR_FILE.read_bytes()))
+    entries = HARParser(zst_path).parse()
+    assert [e.url for e in entries] == [e.url for e in har_entries]
+    assert [e.content for e in entries] == [e.content for e in har_entries]
+
+
+def test_har_parsing_zstd_unavailable(tmp_path, monkeypatch):
+    """Test that a .zst HAR without zstandard installed fails with a clear error."""
+    monkeypatch.setattr(har_parser, "ZSTANDARD_AVAILABLE", False)
+    zst_path = tmp_path / "capture.har.zst"
+    zst_path.write_bytes(b"")
+    with pytest.raises(ValueError, match="zstandard"):
+        HARParser(zst_path).parse()
+
+
 def test_tile_classification(har_entries):
     """Test that tiles are classified correctly."""
     classifier = RequestClassifier()
@@ -60,6 +115,19 @@ def test_tile_classification(har_entries):
     print(f"Found {len(glyphs)} glyph files")
 
 
+def test_classify_tile_entries(har_entries):
+    """Test that the streaming classifier yields just the tiles and counts every type."""
+    classifier = RequestClassifier()
+    grouped = classifier.classify_all(har_entries)
+
+    counts = Counter()
+    tile_entries = list(classifier.classify_tile_entries(har_entries, counts))
+    assert len(tile_entries) == (
+        len(grouped[RequestType.VECTOR_TILE]) + len(grouped[RequestType.RASTER_TILE])
+    )
+    assert counts == Counter({t: len(g) for t, g in grouped.items() if g})
+
+
 def test_tile_detection(har_entries):
     """Test that tile coordinates are extracted correctly."""
     classifier = RequestClassifier()
@@ -128,6 +196,37 @@ def test_coverage_calculation(har_entries):
     print(f"Center: {bounds.center}")
 
 
+def test_bounds_and_zoom_single_pass(har_entries):
+    """Test that the single-pass coverage calculation matches the separate passes."""
+    classifier = RequestClassifier()
+    grouped = classifier.classify_all(har_entries)
+
+    detector = TileDetector()
+    detected = []
+
+    for entry in grouped[RequestType.VECTOR_TILE]:
+        tile = detector.detect(entry.url, entry.content)
+        if tile:
+            detected.append(tile)
+
+    if not detected:
+        pytest.skip("No tiles detected")
+
+    coverage_calc = CoverageCalculator()
+    coords = [t.coord for t in detected]
+    expected = (coverage_calc.calculate_bounds(coords), coverage_calc.get_zoom_range(coords))
+
+    # Agrees with the separate passes, even when fed a generator
+    assert coverage_calc.calculate_bounds_and_zoom(t.coord for t in detected) == expected
+
+    # Merging per-part results matches one pass over all tiles
+    half = len(coords) // 2 or 1
+    parts = [coords[:half], coords[half:]] if coords[half:] else [coords]
+    assert coverage_calc.combine_bounds_and_zoom(
+        coverage_calc.calculate_bounds_and_zoom(part) for part in parts
+    ) == expected
+
+
 def test_source_grouping(har_entries):
     """Test that tiles are grouped by source correctly."""
     classifier = RequestClassifier()
@@ -154,5 +253,361 @@ def test_source_grouping(har_entries):
         assert source.format in ["pbf", "mvt", "png", "jpg", "webp"]
 
 
+def test_source_name_digit_leading_segment():
+    """Dataset segments that start with a digit still name the source."""
+    detector = TileDetector()
+    buildings = detector.detect("https://tiles.x.com/3dbuildings/10/301/385.pbf", b"")
+    data = detector.detect("https://tiles.x.com/2024-data/10/301/385.pbf", b"")
+    assert buildings.source.name == "x-3dbuildings"
+    assert data.source.name == "x-2024-data"
+
+    # Purely numeric segments are still skipped
+    versioned = detector.detect("https://tiles.x.com/2/roads/10/301/385.pbf", b"")
+    assert versioned.source.name == "x-roads"
+
+
+@pytest.fixture
+def vector_source(har_entries):
+    """The first vector tile source detected in the HAR file, with its tiles."""
+    classifier = RequestClassifier()
+    grouped = classifier.classify_all(har_entries)
+
+    detector = TileDetector()
+    detected = []
+
+    for entry in grouped[RequestType.VECTOR_TILE]:
+        tile = detector.detect(entry.url, entry.content)
+        if tile:
+            detected.append(tile)
+
+    if not detected:
+        pytest.skip("No tiles detected")
+
+    source, tiles = next(iter(detector.group_by_source(detected).values()))
+    if source.tile_type != "vector":
+        pytest.skip("First source is not a vector source")
+    return source, tiles
+
+
+def make_builder(output_path, source, tiles, compression="gzip"):
+    """A PMTilesBuilder loaded with tiles and metadata for source."""
+    coverage_calc = CoverageCalculator()
+    bounds, (min_zoom, max_zoom) = coverage_calc.calculate_bounds_and_zoom(c for c, _ in tiles)
+
+    builder = PMTilesBuilder(output_path, compression)
+    builder.add_tiles(tiles)
+    builder.set_metadata(PMTilesMetadata(
+        name=source.name,
+        description="test",
+        bounds=bounds,
+        min_zoom=min_zoom,
+        max_zoom=max_zoom,
+        tile_type=source.tile_type,
+        format=source.format,
+    ))
+    return builder
+
+
+def test_tile_ids_match_reference(vector_source):
+    """Test that batched Hilbert tile IDs match the pmtiles reference."""
+    _, tiles = vector_source
+    coords = [coord for coord, _ in tiles]
+    assert _tile_ids(coords) == [zxy_to_tileid(c.z, c.x, c.y) for c in coords]
+
+
+def test_pmtiles_build_roundtrip(vector_source, tmp_path):
+    """Test that built archives are clustered and every tile reads back."""
+    source, tiles = vector_source
+    output_path = tmp_path / "test.pmtiles"
+    make_builder(output_path, source, tiles).build()
+
+    with open(output_path, "rb") as f:
+        reader = Reader(MmapSource(f))
+        assert reader.header()["clustered"]
+        for coord, _ in tiles:
+            assert reader.get(coord.z, coord.x, coord.y) is not None
+
+
+def test_pmtiles_dedup(vector_source, tmp_path):
+    """Test that identical small tiles are stored once."""
+    source, tiles = vector_source
+    coord = tiles[0][0]
+    payload = b"\x1a\x00"
+    repeated = [
+        (coord, payload),
+        (TileCoord(coord.z + 1, coord.x * 2, coord.y * 2), payload),
+        (TileCoord(coord.z + 1, coord.x * 2 + 1, coord.y * 2), payload),
+    ]
+
+    header = Reader(MemorySource(
+        make_builder(tmp_path / "dedup.pmtiles", source, repeated).build_bytes()
+    )).header()
+
+    assert header["addressed_tiles_count"] == 3
+    assert header["tile_contents_count"] == 1
+
+
+def test_pmtiles_batched_parallel_encode(vector_source, tmp_path, monkeypatch):
+    """Test that encoding tiles on the thread pool in batches matches the serial path."""
+    source, tiles = vector_source
+    serial = make_builder(tmp_path / "serial.pmtiles", source, tiles).build_bytes()
+
+    monkeypatch.setattr(pmtiles_module, "_PARALLEL_GZIP_MIN_TILES", 1)
+    monkeypatch.setattr(pmtiles_module, "_PARALLEL_GZIP_BATCH_TILES", 3)
+    batched = make_builder(tmp_path / "batched.pmtiles", source, tiles).build_bytes()
+
+    assert batched == serial
+
+
+def test_pmtiles_gzip_framing(vector_source, tmp_path):
+    """Test that vector tiles are gzipped exactly once."""
+    source, tiles = vector_source
+    reader = Reader(MemorySource(
+        make_builder(tmp_path / "test.pmtiles", source, tiles).build_bytes()
+    ))
+
+    assert reader.header()["tile_compression"] == Compression.GZIP
+    for coord, _ in tiles:
+        data = reader.get(coord.z, coord.x, coord.y)
+        assert data[:2] == b"\x1f\x8b", "Vector tiles should be gzipped"
+        assert gzip.decompress(data)[:2] != b"\x1f\x8b", "Vector tiles should not be double-gzipped"
+
+
+def test_gzip_framing_check():
+    """Test the header/trailer check that skips re-decompressing gzip tiles."""
+    gzipped = gzip.compress(b"\x1a\x00" * 32)
+    assert _has_valid_gzip_framing(gzipped)
+    assert not _has_valid_gzip_framing(gzipped[:10])
+    assert not _has_valid_gzip_framing(gzipped[:3] + b"\xe0" + gzipped[4:])
+    assert not _has_valid_gzip_framing(gzipped[:-4] + b"\x00\x00\x00\x00")
+    assert not _has_valid_gzip_framing(b"\x1a\x00" * 32)
+
+
+def test_pmtiles_uncompressed(vector_source, tmp_path):
+    """Test that uncompressed output strips any gzip the captured tiles carried."""
+    source, tiles = vector_source
+    reader = Reader(MemorySource(
+        make_builder(tmp_path / "test.pmtiles", source, tiles, "none").build_bytes()
+    ))
+
+    assert reader.header()["tile_compression"] == Compression.NONE
+    for coord, _ in tiles:
+        assert reader.get(coord.z, coord.x, coord.y)[:2] != b"\x1f\x8b"
+
+
+def test_build_for_archive(vector_source, tmp_path, monkeypatch):
+    """Test that small archives are built in memory and large ones on disk."""
+    source, tiles = vector_source
+    output_path = tmp_path / "test.pmtiles"
+    builder = make_builder(output_path, source, tiles)
+
+    in_memory = builder.build_for_archive()
+    assert in_memory == builder.build_bytes()
+    assert not output_path.exists()
+
+    monkeypatch.setattr(pmtiles_module, "_IN_MEMORY_MAX_BYTES", 0)
+    assert builder.build_for_archive() == output_path
+    assert output_path.read_bytes() == in_memory
+
+
+def test_in_memory_limits(monkeypatch):
+    """Test that in-memory sources share one archive-wide budget."""
+    monkeypatch.setattr(pmtiles_module, "_IN_MEMORY_MAX_BYTES", 10)
+    monkeypatch.setattr(pmtiles_module, "_IN_MEMORY_TOTAL_BYTES", 15)
+    coord = TileCoord(0, 0, 0)
+    tile_sets = [[(coord, b"x" * size)] for size in (8, 12, 8, 6)]
+
+    # Too large for one source, then over the remaining budget, then fits
+    assert in_memory_limits(tile_sets) == [10, 0, 0, 10]
+
+
+def test_map_builds_splits_gzip_threads():
+    """Test that parallel builds share the CPUs between their gzip thread pools."""
+    def build(name, gzip_threads=None):
+        return name, gzip_threads
+
+    builds = [("a",), ("b",)]
+    assert map_builds(build, builds, 0, 2) == [("a", None), ("b", None)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = map_builds(build, builds, PARALLEL_BUILD_MIN_TILES, 2, executor)
+    threads = max(1, (os.cpu_count() or 1) // 2)
+    assert results == [("a", threads), ("b", threads)]
+
+
+def test_packager_pmtiles_storage(vector_source, tmp_path):
+    """Test that the packager deflates uncompressed-tile archives and stores the rest."""
+    source, tiles = vector_source
+    raw = make_builder(tmp_path / "raw.pmtiles", source, tiles, "none").build_bytes()
+    gzipped = make_builder(tmp_path / "gzipped.pmtiles", source, tiles).build_bytes()
+
+    packager = ArchivePackager(tmp_path / "archive.zip")
+    packager.add_pmtiles("raw", raw, tiles_compressed=False)
+    packager.add_pmtiles("gzipped", gzipped)
+    packager.set_manifest("Test", "test", GeoBounds(-1, -1, 1, 1), (0, 1), [])
+    packager.build()
+
+    with zipfile.ZipFile(tmp_path / "archive.zip") as zf:
+        assert zf.getinfo("tiles/raw.pmtiles").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.getinfo("tiles/gzipped.pmtiles").compress_type == zipfile.ZIP_STORED
+        assert zf.read("tiles/raw.pmtiles") == raw
+        assert zf.read("tiles/gzipped.pmtiles") == gzipped
+
+
+def make_viewer_config(captured_style=None):
+    """A one-source viewer config, on the captured-style branch if a style is given."""
+    return ViewerConfig(
+        name="Test",
+        bounds=GeoBounds(west=-74.1, south=40.6, east=-73.9, north=40.8),
+        min_zoom=10,
+        max_zoom=14,
+        tile_sources=[{
+            "name": "data",
+            "path": "tiles/data.pmtiles",
+            "type": "vector",
+            "isOrphan": True,
+            "extractedStyle": {"allLayers": ["roads", "parks"], "layerType": "line"},
+        }],
+        created_at="2024-01-01",
+        captured_style=captured_style,
+    )
+
+
+CAPTURED_STYLE = {
+    "sprite": "./sprites/sprite",
+    "glyphs": "/glyphs/{fontstack}/{range}.pbf",
+    "layers": [{"id": "label", "layout": {"text-font": ["Noto Sans", "Arial"]}}],
+}
+
+BRANCHED_TEMPLATE = """start
+    // @captured
+    captured
+    // @default
+    default
+    // @end
+end
+"""
+
+
+def embedded_config(html):
+    """The config object the viewer page embeds for JavaScript."""
+    return json.loads(html.split("const config = ", 1)[1].split(";\n", 1)[0])
+
+
+def test_template_precompilation():
+    """Test that precompiled templates render exactly like str.format."""
+    template = _precompile("{{literal}} {name}: {count}{{}}")
+    assert template.chunks == ["{literal} ", ": ", "{}"]
+    assert template.fields == ["name", "count"]
+    assert template.chunks_bytes == [c.encode("utf-8") for c in template.chunks]
+    assert _render(template, {"name": "a", "count": "1"}) == "{literal} a: 1{}"
+
+    values = ViewerGenerator()._field_values(make_viewer_config())
+    expected = _select_branch(VIEWER_TEMPLATE, "default").format(**values)
+    assert _render(_TEMPLATE_DEFAULT, values) == expected
+
+
+def test_select_branch():
+    """Test that each branch keeps its own lines and drops the markers."""
+    assert _select_branch(BRANCHED_TEMPLATE, "captured") == "start\n    captured\nend\n"
+    assert _select_branch(BRANCHED_TEMPLATE, "default") == "start\n    default\nend\n"
+
+
+@pytest.mark.parametrize("template, error", [
+    ("start\n// @captured\ncaptured\n", "ends inside"),
+    ("start\n// @end\nend\n", "no open branch"),
+    ("// @captured\ncaptured\n// @defualt\ndefault\n// @end\n", "unknown marker"),
+    ("// @captured\ncaptured\n// @end\n// @end\n", "no open branch"),
+])
+def test_select_branch_malformed(template, error):
+    """Test that missing or malformed branch markers are rejected."""
+    with pytest.raises(ValueError, match=error):
+        _select_branch(template, "captured")
+
+
+def test_select_branch_unknown_branch():
+    """Test that only the captured and default branches can be selected."""
+    with pytest.raises(ValueError, match="Unknown template branch"):
+        _select_branch(BRANCHED_TEMPLATE, "original")
+
+
+def test_viewer_branch_selection():
+    """Test that the viewer ships only the style branch its config uses."""
+    generator = ViewerGenerator()
+
+    default_html = generator.generate(make_viewer_config())
+    assert "precomputedStyle" in default_html
+    assert "captured_style.json" not in default_html
+
+    captured_html = generator.generate(make_viewer_config(prepare_captured_style(CAPTURED_STYLE)))
+    assert "captured_style.json" in captured_html
+    assert "precomputedStyle" not in captured_html
+
+
+def test_viewer_precomputed_style():
+    """Test that the default branch embeds the default style for every source layer."""
+    config = embedded_config(ViewerGenerator().generate(make_viewer_config()))
+    layer_ids = [layer["id"] for layer in config["precomputedStyle"]["layers"]]
+    assert layer_ids == ["background", "data-line-0", "data-line-1"]
+    assert config["layerGroups"]["data"]["sourceLayers"] == ["roads", "parks"]
+
+
+def test_viewer_config_json_compact():
+    """Test that the embedded config is compact JSON with non-ASCII kept as-is."""
+    config = make_viewer_config()
+    config.tile_sources[0]["extractedStyle"]["allLayers"] = ["straße"]
+    html = ViewerGenerator().generate(config)
+    config_json = html.split("const config = ", 1)[1].split(";\n", 1)[0]
+
+    assert "straße" in config_json
+    assert config_json == json.dumps(
+        json.loads(config_json), separators=(",", ":"), ensure_ascii=False
+    )
+
+
+def test_prepare_captured_style():
+    """Test that captured styles get page-relative URLs and one font per stack."""
+    style = prepare_captured_style(CAPTURED_STYLE)
+    assert style["sprite"] == "sprites/sprite"
+    assert style["glyphs"] == "glyphs/{fontstack}/{range}.pbf"
+    assert style["layers"][0]["layout"]["text-font"] == ["Noto Sans"]
+
+
+def test_viewer_write_gz_sidecar(tmp_path):
+    """Test that write() streams the page and a reproducible viewer.html.gz."""
+    generator = ViewerGenerator()
+    config = make_viewer_config(prepare_captured_style(CAPTURED_STYLE))
+    output_path = tmp_path / "viewer.html"
+    gz_path = tmp_path / "viewer.html.gz"
+
+    generator.write(config, output_path)
+    assert output_path.read_text(encoding="utf-8") == generator.generate(config)
+    gz_bytes = gz_path.read_bytes()
+    assert gzip.decompress(gz_bytes) == output_path.read_bytes()
+
+    generator.write(config, output_path)
+    assert gz_path.read_bytes() == gz_bytes
+
+    gz_path.unlink()
+    generator.write(config, output_path, precompress=False)
+    assert not gz_path.exists()
+
+
+def test_packager_viewer_gz(tmp_path):
+    """Test that archives carry the same precompressed viewer, stored as-is."""
+    generator = ViewerGenerator()
+    config = make_viewer_config()
+    generator.write(config, tmp_path / "viewer.html")
+
+    packager = ArchivePackager(tmp_path / "archive.zip")
+    packager.add_viewer(generator.generate(config))
+    packager.set_manifest("Test", "test", config.bounds, (10, 14), [])
+    packager.build()
+
+    with zipfile.ZipFile(tmp_path / "archive.zip") as zf:
+        assert zf.read("viewer.html.gz") == (tmp_path / "viewer.html.gz").read_bytes()
+        assert zf.getinfo("viewer.html.gz").compress_type == zipfile.ZIP_STORED
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
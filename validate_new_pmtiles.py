@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Validate the newly created PMTiles files."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 
@@ -13,13 +14,15 @@ pmtiles_files = [
     Path("nyc-parking-test-phase1/tiles/wxy-labs-parking_regs_v2.pmtiles"),
 ]
 
-for pmtiles_path in pmtiles_files:
+# Validate all files concurrently; map() keeps results in list order
+with ThreadPoolExecutor(max_workers=len(pmtiles_files)) as executor:
+    results = list(executor.map(validate_pmtiles, pmtiles_files))
+
+for pmtiles_path, result in zip(pmtiles_files, results):
     print(f"\n{'='*70}")
     print(f"Validating: {pmtiles_path.name}")
     print(f"{'='*70}")
 
-    result = validate_pmtiles(pmtiles_path)
-
     if not result.get("valid"):
         print(f"❌ Validation failed: {result.get('error')}")
         continue